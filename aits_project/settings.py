@@ -30,6 +30,11 @@ EMAIL_HOST_USER = 'kennedymutebi7@gmail.com'  # Replace with your email
 EMAIL_HOST_PASSWORD = 'PSS@12345'  # Replace with your password
 DEFAULT_FROM_EMAIL = 'kennedymutebi7@gmail.com'  # Replace with your from email
 
+# Outbox delivery (see apps.issues.mail and the send_outbox_mail command)
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5  # Dead-letter a message after this many failed sends
+EMAIL_OUTBOX_RETRY_DELAY = 60  # Seconds before the first retry, doubled on each failure
+EMAIL_OUTBOX_LEASE = 300  # Seconds a claimed batch is hidden from other workers
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -123,6 +128,38 @@ DATABASES = {
     }
 }
 
+# Cache configuration
+# Per-process LocMemCache by default. Point DJANGO_CACHE_BACKEND/LOCATION at a
+# shared cache (e.g. django.core.cache.backends.redis.RedisCache) when running
+# more than one worker, since counters and cached lookups live here.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'aits'),
+    }
+}
+# Whether every worker sees the same cache. Features that trust cached
+# version counters (issue list ETags, list response caching, cached_db
+# sessions) turn themselves off without one.
+SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Seconds between keep-alive comments on the notification event stream
+EVENT_STREAM_HEARTBEAT = 15
+
+# Process-local cache of resolved token/JWT -> user lookups
+# (see apps.authentication.authentication)
+AUTH_CACHE_SIZE = 10000  # Entries per process
+AUTH_CACHE_TTL = 60  # Seconds
+
+# Cached list responses for courses, categories and enrollments
+# (see apps.issues.response_cache). Entries are versioned, so the TTL only
+# bounds how long unused ones linger.
+RESPONSE_CACHE_LOCAL_SIZE = 500  # Entries per process
+RESPONSE_CACHE_TTL = 300  # Seconds
+
 # Custom user model
 AUTH_USER_MODEL = 'authentication.User'
 
@@ -145,6 +182,25 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PBKDF2 by default. Set AITS_PASSWORD_HASHER=scrypt or argon2 (needs argon2-cffi)
+# to opt in to a tuned hasher; existing hashes are upgraded on the next login.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'apps.authentication.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'apps.authentication.hashers.TunedScryptPasswordHasher',
+]
+_PREFERRED_HASHERS = {
+    'argon2': 'apps.authentication.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'apps.authentication.hashers.TunedScryptPasswordHasher',
+}
+_preferred_hasher = _PREFERRED_HASHERS.get(os.environ.get('AITS_PASSWORD_HASHER', '').lower())
+if _preferred_hasher:
+    PASSWORD_HASHERS.remove(_preferred_hasher)
+    PASSWORD_HASHERS.insert(0, _preferred_hasher)
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Africa/Kampala'
@@ -168,16 +224,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.authentication.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.BasicAuthentication',  # Optionally include this
+        'apps.authentication.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated'
 
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.issues.pagination.KeysetPagination',
     'PAGE_SIZE': 10
 }
 
@@ -200,7 +255,22 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_CREDENTIALS = True
 
 # Session settings
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Session storage, chosen per deployment with AITS_SESSION_STORE:
+#   cached_db      - reads served from CACHES, writes go through to the DB
+#                    (default with a shared cache)
+#   signed_cookies - no server-side storage at all; sessions can't be revoked early
+#   cache          - cache only; needs a persistent shared cache
+#   db             - one django_session SELECT per request (default otherwise,
+#                    since a per-process cache would keep logged-out sessions
+#                    alive in other workers)
+# Expired rows are removed by the purge_sessions command.
+SESSION_ENGINES = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'db': 'django.contrib.sessions.backends.db',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('AITS_SESSION_STORE', 'cached_db' if SHARED_CACHE else 'db')]
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
 SESSION_COOKIE_SECURE = False  # Set to True in production with HTTPS
 SESSION_COOKIE_HTTPONLY = True
@@ -219,6 +289,29 @@ CSRF_TRUSTED_ORIGINS = [
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 FILE_UPLOAD_PERMISSIONS = 0o644
 
+# Bulk registration over the API (see apps.authentication.bulk_import). Larger
+# files go through the import_users command, which hashes in a process pool.
+BULK_REGISTRATION_MAX_ROWS = 200
+BULK_REGISTRATION_WORKERS = 4  # Password hashing threads per request
+
+# Resumable chunked attachment uploads (see apps.issues.uploads)
+CHUNKED_UPLOAD_MAX_SIZE = 200 * 1024 * 1024  # Largest file accepted, in bytes
+CHUNKED_UPLOAD_MAX_CHUNK = 8 * 1024 * 1024  # Largest single chunk, in bytes
+CHUNKED_UPLOAD_EXPIRY = 24 * 60 * 60  # Seconds before an idle partial upload is purged
+
+# Attachment downloads (see apps.issues.downloads). Empty: Django streams the
+# file itself. 'x-accel' (nginx) or 'x-sendfile' (Apache, lighttpd): Django only
+# checks permissions and the front proxy sends the bytes. For x-accel, map
+# ATTACHMENT_ACCEL_PREFIX to MEDIA_ROOT as an internal location.
+ATTACHMENT_SENDFILE = os.environ.get('AITS_SENDFILE', '')
+ATTACHMENT_ACCEL_PREFIX = '/protected-media/'
+
+# Thumbnail / text extraction jobs (see apps.issues.artifacts and the
+# process_attachments command). Pillow, pypdf and pypdfium2 are optional;
+# without them the matching jobs are marked unsupported.
+ATTACHMENT_JOB_LEASE = 600  # Seconds a claimed job is hidden from other workers
+ATTACHMENT_JOB_MAX_ATTEMPTS = 3
+
 # Logging configuration
 LOGGING = {
     'version': 1,
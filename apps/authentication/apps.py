@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AuthenticationConfig(AppConfig):
+    name = 'apps.authentication'
+
+    def ready(self):
+        # Register signal receivers
+        from . import signals  # noqa: F401
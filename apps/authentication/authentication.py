@@ -0,0 +1,112 @@
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from apps.common.caching import TTLCache
+from apps.common.versions import get_versions, increment_version
+
+GENERATION = 'auth-user:{}'
+
+
+def get_generation(user_id):
+    """
+    The user's credential generation. A missing (or evicted) counter starts
+    again from the clock, so entries cached under an older one stay invalid.
+    """
+    return get_versions(GENERATION.format(user_id))[0]
+
+
+def invalidate_user(user_id):
+    """
+    Drop every cached credential of ``user_id``, in every process sharing
+    the cache, by bumping the user's generation.
+    """
+    increment_version(GENERATION.format(user_id))
+
+
+def freeze(instance):
+    """The loaded field values of a model instance, for ``thaw``."""
+    fields = instance._meta.concrete_fields
+    return (type(instance), instance._state.db,
+            tuple(field.attname for field in fields),
+            tuple(getattr(instance, field.attname) for field in fields))
+
+
+def thaw(frozen):
+    """A fresh instance built from ``freeze`` output, as if just loaded."""
+    model, db, names, values = frozen
+    return model.from_db(db, names, values)
+
+
+class CachedCredentialsMixin:
+    """
+    Keeps resolved credential -> user lookups in a process-local LRU.
+
+    A hit costs one shared-cache read of the user's generation instead of a
+    token join or user fetch; entries from an older generation are ignored.
+    Only field values are cached: every request gets its own instances, so
+    changes one request makes to its user never leak into another's.
+    Without settings.SHARED_CACHE nothing is cached, since generations bumped
+    in one worker wouldn't be seen by the others.
+    """
+    credential_cache = None
+
+    @classmethod
+    def get_credential_cache(cls):
+        if cls.credential_cache is None:
+            cls.credential_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+        return cls.credential_cache
+
+    def get_cached(self, credential):
+        if not settings.SHARED_CACHE:
+            # Another worker's logout or password change would never reach us
+            return None
+        entry = self.get_credential_cache().get(credential)
+        if entry is None:
+            return None
+        value, user_id, generation = entry
+        if generation != get_generation(user_id):
+            self.get_credential_cache().discard(credential)
+            return None
+        return value
+
+    def set_cached(self, credential, value, user_id):
+        if not settings.SHARED_CACHE:
+            return
+        self.get_credential_cache().set(credential, (value, user_id, get_generation(user_id)))
+
+
+class CachedTokenAuthentication(CachedCredentialsMixin, TokenAuthentication):
+    """
+    DRF token authentication with the token -> user lookup cached.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = self.get_cached(key)
+        if cached is not None:
+            user, token = thaw(cached[0]), thaw(cached[1])
+            token.user = user
+            return user, token
+        user, token = super().authenticate_credentials(key)
+        self.set_cached(key, (freeze(user), freeze(token)), user.pk)
+        return user, token
+
+
+class CachedJWTAuthentication(CachedCredentialsMixin, JWTAuthentication):
+    """
+    JWT authentication with the token subject -> user lookup cached. The
+    token signature and expiry are still checked on every request.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        credential = ('jwt', user_id)
+        cached = self.get_cached(credential)
+        if cached is not None:
+            return thaw(cached)
+        user = super().get_user(validated_token)
+        self.set_cached(credential, freeze(user), user.pk)
+        return user
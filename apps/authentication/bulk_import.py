@@ -0,0 +1,195 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from .models import User, Student, Lecturer
+from .serializers import BulkStudentRowSerializer, BulkLecturerRowSerializer
+
+FORMATS = ('csv', 'json', 'jsonl')
+
+# role -> (row serializer, profile model, unique profile field, profile fields)
+ROLES = {
+    'student': (BulkStudentRowSerializer, Student, 'student_id', ('student_id', 'program', 'year_of_study')),
+    'lecturer': (BulkLecturerRowSerializer, Lecturer, 'staff_id', ('staff_id',)),
+}
+
+USER_FIELDS = ('username', 'email', 'first_name', 'last_name', 'phone_number', 'department')
+
+
+def guess_format(filename):
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    if extension == 'ndjson':
+        return 'jsonl'
+    return extension if extension in FORMATS else None
+
+
+def iter_rows(stream, fmt):
+    """
+    Yield row dicts from a text stream. CSV and JSON Lines are read one row
+    at a time; a plain JSON array has to be parsed whole, so prefer JSON
+    Lines for large files.
+    """
+    if fmt == 'csv':
+        try:
+            yield from csv.DictReader(stream)
+        except csv.Error as e:
+            raise ValueError(str(e)) from e
+    elif fmt == 'jsonl':
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Reported as an invalid row by the serializer
+                yield None
+    elif fmt == 'json':
+        yield from json.load(stream)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+class BulkUserImporter:
+    """
+    Imports students or lecturers in chunks. Each chunk is validated, checked
+    for duplicates with one query per unique column, has its passwords hashed
+    in a process pool and is written with bulk_create in its own transaction.
+    With ``processes=False`` hashing uses threads instead (the hashers
+    release the GIL), for callers such as web requests that must not fork.
+    """
+
+    def __init__(self, role, chunk_size=1000, workers=None, processes=True):
+        if role not in ROLES:
+            raise ValueError(f"Unknown role: {role}")
+        self.role = role
+        self.row_serializer, self.profile_model, self.profile_key, self.profile_fields = ROLES[role]
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self.created = 0
+        self.processed = 0
+        self.errors = []
+        self._seen = {'username': set(), 'email': set(), self.profile_key: set()}
+
+    def run(self, rows):
+        start = time.perf_counter()
+        numbered = enumerate(rows, start=1)
+        with self.executor(max_workers=self.workers) as pool:
+            while True:
+                chunk = list(islice(numbered, self.chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, pool)
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        return {
+            'processed': self.processed,
+            'created': self.created,
+            'failed': len(self.errors),
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(self.processed / elapsed, 1) if elapsed else None,
+            'errors': self.errors,
+        }
+
+    def import_chunk(self, chunk, pool):
+        self.processed += len(chunk)
+        valid = []
+        for line, data in chunk:
+            serializer = self.row_serializer(data=data)
+            if serializer.is_valid():
+                valid.append((line, normalize(serializer.validated_data)))
+            else:
+                self.errors.append({'row': line, 'errors': serializer.errors})
+
+        valid = self.drop_duplicates(valid)
+        if not valid:
+            return
+
+        passwords = [data['password'] for _, data in valid]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        hashes = list(pool.map(make_password, passwords, chunksize=chunksize))
+
+        users = [
+            User(user_type=self.role, password=password, **{field: data[field] for field in USER_FIELDS})
+            for (_, data), password in zip(valid, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                # MySQL can't return ids from a bulk insert; look them up in one query
+                user_ids = dict(
+                    User.objects.filter(username__in=[user.username for user in users])
+                    .values_list('username', 'pk')
+                )
+                self.profile_model.objects.bulk_create([
+                    self.profile_model(
+                        user_id=user_ids[data['username']],
+                        **{field: data[field] for field in self.profile_fields}
+                    )
+                    for _, data in valid
+                ])
+        except IntegrityError as e:
+            # A concurrent registration took one of the values; the chunk rolled back
+            for line, _ in valid:
+                self.errors.append({'row': line, 'errors': {'non_field_errors': [str(e)]}})
+            return
+        self.created += len(valid)
+
+    def drop_duplicates(self, valid):
+        """
+        Reject rows clashing with earlier rows of the file or with the
+        database. Usernames and emails are compared case-insensitively.
+        """
+        existing = {
+            'username': taken_case_insensitive('username', [data['username'] for _, data in valid]),
+            'email': taken_case_insensitive('email', [data['email'] for _, data in valid]),
+            self.profile_key: set(self.profile_model.objects.filter(
+                **{f'{self.profile_key}__in': [data[self.profile_key] for _, data in valid]}
+            ).values_list(self.profile_key, flat=True)),
+        }
+
+        unique = []
+        for line, data in valid:
+            errors = {}
+            for field, taken in existing.items():
+                key = duplicate_key(field, data[field])
+                if key in taken or key in self._seen[field]:
+                    errors[field] = [f"Duplicate {field}: {data[field]}"]
+            if errors:
+                self.errors.append({'row': line, 'errors': errors})
+                continue
+            for field in existing:
+                self._seen[field].add(duplicate_key(field, data[field]))
+            unique.append((line, data))
+        return unique
+
+
+def normalize(data):
+    """Apply the normalisation create_user does to single registrations."""
+    data['username'] = User.normalize_username(data['username'])
+    data['email'] = User.objects.normalize_email(data['email'])
+    return data
+
+
+def duplicate_key(field, value):
+    return value.casefold() if field in ('username', 'email') else value
+
+
+def taken_case_insensitive(field, values):
+    """Duplicate keys of the stored ``field`` values equal to one of ``values`` ignoring case."""
+    # Served by the LOWER() indexes on users
+    stored = (
+        User.objects.annotate(lowered=Lower(field))
+        .filter(lowered__in={value.lower() for value in values})
+        .values_list(field, flat=True)
+    )
+    return {duplicate_key(field, value) for value in stored}
@@ -0,0 +1,22 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the OWASP minimum profile (19 MiB, 2 passes, 1 lane).
+
+    Keeps the ``argon2`` algorithm name so existing Argon2 hashes still
+    verify; hashes made with other parameters are upgraded on login.
+    """
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt with N=2**14, r=8, p=1: about 16 MiB per hash on one core.
+    """
+    work_factor = 2 ** 14
+    block_size = 8
+    parallelism = 1
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.authentication.authentication import CachedTokenAuthentication
+
+
+class Command(BaseCommand):
+    help = "Compare per-request authentication overhead of plain and cached token auth."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000,
+                            help="Requests authenticated per variant.")
+        parser.add_argument('--token', help="Token key to use (defaults to the first token).")
+
+    def handle(self, *args, **options):
+        token = Token.objects.filter(key=options['token']) if options['token'] else Token.objects.all()
+        token = token.first()
+        if token is None:
+            raise CommandError("No auth token found; create one first.")
+
+        factory = APIRequestFactory()
+        http_request = factory.get('/', HTTP_AUTHORIZATION=f'Token {token.key}')
+        variants = [('token', TokenAuthentication), ('cached token', CachedTokenAuthentication)]
+
+        for name, authentication_class in variants:
+            authenticator = authentication_class()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(options['requests']):
+                    authenticator.authenticate(Request(http_request))
+                elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{name:<14} {elapsed / options['requests'] * 1e6:8.1f} us/request  "
+                f"{len(queries) / options['requests']:.2f} queries/request"
+            )
@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, get_hashers_by_algorithm
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure single-core login throughput for each configured password "
+        "hasher: one verification per login, as done by LoginView."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=2.0,
+                            help="Time spent measuring each hasher.")
+        parser.add_argument('--password', default='correct horse battery staple')
+
+    def handle(self, *args, **options):
+        preferred = get_hasher('default').algorithm
+        self.stdout.write(f"Preferred hasher: {preferred} ({settings.PASSWORD_HASHERS[0]})")
+
+        for algorithm, hasher in get_hashers_by_algorithm().items():
+            try:
+                encoded = hasher.encode(options['password'], hasher.salt())
+            except (ValueError, ImportError) as e:
+                self.stdout.write(f"{algorithm:<16} unavailable: {e}")
+                continue
+
+            runs = 0
+            start = time.perf_counter()
+            deadline = start + options['seconds']
+            while time.perf_counter() < deadline:
+                hasher.verify(options['password'], encoded)
+                runs += 1
+            elapsed = time.perf_counter() - start
+
+            per_second = runs / elapsed
+            self.stdout.write(
+                f"{algorithm:<16} {elapsed / runs * 1000:8.1f} ms/verify  "
+                f"{per_second:8.1f} logins/s/core"
+            )
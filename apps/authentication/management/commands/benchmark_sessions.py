@@ -0,0 +1,38 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class Command(BaseCommand):
+    help = "Measure the per-request cost of loading a session with each session engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000,
+                            help="Session loads measured per engine.")
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        for name, engine in settings.SESSION_ENGINES.items():
+            store_class = import_module(engine).SessionStore
+
+            session = store_class()
+            session['_auth_user_id'] = '1'
+            session.save()
+            # For signed_cookies this is the signed payload the browser sends back
+            session_key = session.session_key
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(requests):
+                    store_class(session_key).load()
+                elapsed = time.perf_counter() - start
+
+            session.delete()
+            self.stdout.write(
+                f"{name:<15} {elapsed / requests * 1e6:8.1f} us/request  "
+                f"{len(queries) / requests:.2f} queries/request"
+            )
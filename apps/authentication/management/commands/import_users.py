@@ -0,0 +1,36 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.authentication.bulk_import import FORMATS, ROLES, BulkUserImporter, guess_format, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk-register students or lecturers from a CSV, JSON or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--role', choices=sorted(ROLES), required=True)
+        parser.add_argument('--format', choices=FORMATS,
+                            help="File format (guessed from the extension by default).")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int,
+                            help="Password hashing processes (defaults to the CPU count).")
+        parser.add_argument('--report', help="Write the per-row error report to this JSON file.")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+        if fmt is None:
+            raise CommandError("Cannot guess the file format; pass --format.")
+
+        importer = BulkUserImporter(options['role'], options['chunk_size'], options['workers'])
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            report = importer.run(iter_rows(stream, fmt))
+
+        if options['report']:
+            with open(options['report'], 'w') as output:
+                json.dump(report['errors'], output, indent=2)
+        self.stdout.write(
+            f"{report['created']} created, {report['failed']} failed of {report['processed']} rows "
+            f"in {report['seconds']}s ({report['rows_per_second']} rows/s)"
+        )
@@ -0,0 +1,45 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired database sessions in small batches so the purge never "
+        "holds long locks on django_session. Unlike clearsessions it can run "
+        "continuously as a background job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Sessions deleted per statement.")
+        parser.add_argument('--pause', type=float, default=0.1,
+                            help="Seconds to sleep between batches.")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep running, purging every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=3600,
+                            help="Seconds between purges with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = self.purge(options['batch_size'], options['pause'])
+            self.stdout.write(f"Purged {deleted} expired sessions")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def purge(self, batch_size, pause):
+        deleted = 0
+        while True:
+            # Cut-off per batch so sessions expiring meanwhile are picked up too
+            keys = list(
+                Session.objects.filter(expire_date__lt=timezone.now())
+                .values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                return deleted
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+            if pause:
+                time.sleep(pause)
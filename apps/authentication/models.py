@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser
 
 class User(AbstractUser):
@@ -17,6 +18,11 @@ class User(AbstractUser):
 
     class Meta:
         db_table = 'users'
+        indexes = [
+            # Case-insensitive duplicate checks of the bulk import
+            models.Index(Lower('username'), name='users_username_lower_idx'),
+            models.Index(Lower('email'), name='users_email_lower_idx'),
+        ]
 
 class Student(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.hashers import make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from .models import User, Student, Lecturer
 
 
@@ -70,3 +71,27 @@ class LecturerRegistrationSerializer(serializers.ModelSerializer):
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField(max_length=150)
     password = serializers.CharField(write_only=True)
+
+
+class BulkUserRowSerializer(serializers.Serializer):
+    """
+    One row of a bulk registration file. Uniqueness is checked per chunk by
+    the importer rather than with one query per row.
+    """
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField()
+    password = serializers.CharField(write_only=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    phone_number = serializers.CharField(max_length=15, required=False, allow_blank=True, default='')
+    department = serializers.CharField(max_length=100)
+
+
+class BulkStudentRowSerializer(BulkUserRowSerializer):
+    student_id = serializers.CharField(max_length=20)
+    program = serializers.CharField(max_length=100)
+    year_of_study = serializers.IntegerField()
+
+
+class BulkLecturerRowSerializer(BulkUserRowSerializer):
+    staff_id = serializers.CharField(max_length=20)
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_credentials_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Password changes, deactivation and role changes all go through save().
+    The last_login bump done on every login is not a reason to invalidate.
+    """
+    if created:
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_credentials_on_delete(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_credentials_on_token_delete(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+@receiver(user_logged_out)
+def invalidate_cached_credentials_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
@@ -0,0 +1,52 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .bulk_import import BulkUserImporter
+from .models import Student, User
+
+HEADER = "username,email,password,department,student_id,program,year_of_study\n"
+
+
+def student_row(username, email, student_id):
+    return f"{username},{email},secret-pass,CS,{student_id},BSc,1\n"
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BulkImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@example.org', 'x', user_type='admin', department='IT')
+        User.objects.create_user('Jane.Doe', 'Jane@Example.org', 'x', user_type='student', department='CS')
+
+    def test_duplicates_of_stored_users_ignore_case(self):
+        rows = [
+            {'username': 'jane.doe', 'email': 'new@example.org', 'password': 'x', 'department': 'CS',
+             'student_id': 'S1', 'program': 'BSc', 'year_of_study': 1},
+            {'username': 'john', 'email': 'JANE@example.org', 'password': 'x', 'department': 'CS',
+             'student_id': 'S2', 'program': 'BSc', 'year_of_study': 1},
+            {'username': 'ok', 'email': 'ok@example.org', 'password': 'x', 'department': 'CS',
+             'student_id': 'S3', 'program': 'BSc', 'year_of_study': 1},
+        ]
+        report = BulkUserImporter('student', workers=1, processes=False).run(rows)
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([(error['row'], sorted(error['errors'])) for error in report['errors']],
+                         [(1, ['username']), (2, ['email'])])
+        self.assertTrue(Student.objects.filter(student_id='S3', user__username='ok').exists())
+
+    def post(self, content):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        upload = SimpleUploadedFile('students.csv', content.encode(), content_type='text/csv')
+        return client.post('/auth/register/bulk', {'file': upload, 'role': 'student'}, format='multipart')
+
+    @override_settings(BULK_REGISTRATION_MAX_ROWS=2)
+    def test_request_imports_are_capped(self):
+        response = self.post(HEADER + student_row('a', 'a@example.org', 'S1') + student_row('b', 'b@example.org', 'S2'))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+
+        rows = ''.join(student_row(name, f'{name}@example.org', f'S-{name}') for name in 'cde')
+        response = self.post(HEADER + rows)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(User.objects.filter(username='c').exists())
@@ -4,6 +4,7 @@ from rest_framework.authtoken.views import obtain_auth_token
 from .views import (
     StudentRegistrationView,
     LecturerRegistrationView,
+    BulkRegistrationView,
     LoginView,
     CustomLogoutView,
     TestView
@@ -13,6 +14,7 @@ from .views import AdminRegistrationView
 urlpatterns = [
     path('register/student', StudentRegistrationView.as_view(), name='register-student'),
     path('register/lecturer', LecturerRegistrationView.as_view(), name='register-lecturer'),
+    path('register/bulk', BulkRegistrationView.as_view(), name='register-bulk'),
     path('login', LoginView.as_view(), name='login'),
     path('logout', CustomLogoutView.as_view(), name='logout'),  
     path('auth-token/', obtain_auth_token, name='auth-token'),
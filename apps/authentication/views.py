@@ -1,9 +1,8 @@
 from django.http import JsonResponse, HttpResponse
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import login, logout
 from django.views import View
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.views import LogoutView
@@ -13,13 +12,13 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse
 from apps.authentication.models import Student  # Import your Student model
 from rest_framework import generics
 from django.contrib.auth.hashers import make_password  # Import password hashing
-from django.contrib.auth import get_user_model, authenticate, login
-from django.contrib.auth.hashers import check_password
+from django.contrib.auth import get_user_model, login
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.views import APIView
+from .authentication import CachedTokenAuthentication
+from .bulk_import import FORMATS, ROLES, BulkUserImporter, guess_format, iter_rows
 from .serializers import StudentRegistrationSerializer, LecturerRegistrationSerializer, LoginSerializer, UserSerializer
 from .models import Lecturer
 from django.views.decorators.csrf import csrf_exempt
@@ -29,7 +28,11 @@ from django.http import JsonResponse
 from django.contrib.auth import get_user_model  # Import User model dynamically
 from .serializers import AdminRegistrationSerializer
 from django.shortcuts import render
+from rest_framework.parsers import MultiPartParser
+import io
 import logging
+from itertools import islice
+from django.conf import settings
 logger = logging.getLogger(__name__)
 def home_view(request):
     return render(request, 'home.html') 
@@ -54,9 +57,31 @@ class MyAPIView(View):
 
 
 
+def verify_credentials(username, password):
+    """
+    Look the user up once and verify the password with a single hash.
+    
+    Unknown users still pay for one hash so response times don't reveal
+    which usernames exist. check_password() re-hashes with the preferred
+    hasher on success, which upgrades old hashes transparently.
+    """
+    User = get_user_model()
+    try:
+        user = User._default_manager.get_by_natural_key(username)
+    except User.DoesNotExist:
+        User().set_password(password)
+        logger.info("Login failed for unknown username")
+        return None
+    
+    if not user.check_password(password) or not user.is_active:
+        logger.info("Login failed for user %s", user.pk)
+        return None
+    return user
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class LoginView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
 
     def post(self, request):
@@ -65,55 +90,25 @@ class LoginView(APIView):
             username = serializer.validated_data["username"]
             password = serializer.validated_data["password"]
             
-            print(f"Login attempt for username: {username}")
-            
-            # Get the User model
-            User = get_user_model()
-            
-            try:
-                user_obj = User.objects.get(username=username)
-                print("User found in database")
-
-                if check_password(user_obj.password, password):
-                    print("✅ Password is correct!")
-                else:
-                    print("❌ Password does not match")  
-                # Check if password matches
-                if not check_password(password, user_obj.password):
-                    print("Incorrect password")
-                    return Response(
-                        {"message": "Invalid credentials", "detail": "Incorrect password."},
-                        status=status.HTTP_401_UNAUTHORIZED
-                    )
-                
-            except User.DoesNotExist:
-                print("User not found in database")
+            user = verify_credentials(username, password)
+            if user is None:
                 return Response(
-                    {"message": "Invalid credentials", "detail": "User not found."},
+                    {"message": "Invalid credentials", "detail": "Invalid username or password."},
                     status=status.HTTP_401_UNAUTHORIZED
                 )
             
-            # Authenticate user
-            user = authenticate(username=username, password=password)
-            
-            if user is not None:
-                login(request, user)
-                return Response({
-                    "message": "Login successful",
-                    "user": {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "user_type": user.user_type,
-                        "first_name": user.first_name,
-                        "last_name": user.last_name,
-                    },
-                })
-            
-            return Response(
-                {"message": "Invalid credentials", "detail": "Authentication failed."},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+            login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+            return Response({
+                "message": "Login successful",
+                "user": {
+                    "id": user.id,
+                    "username": user.username,
+                    "email": user.email,
+                    "user_type": user.user_type,
+                    "first_name": user.first_name,
+                    "last_name": user.last_name,
+                },
+            })
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 # views.py
@@ -132,6 +127,45 @@ class AdminRegistrationView(APIView):
 
 
 
+class BulkRegistrationView(APIView):
+    """
+    Admin-only bulk registration of students or lecturers from an uploaded
+    CSV, JSON or JSON Lines file. Returns counts, throughput and a per-row
+    error report.
+    
+    Passwords are hashed by a few threads inside the request, so files are
+    capped at BULK_REGISTRATION_MAX_ROWS; larger imports use the
+    import_users command.
+    """
+    parser_classes = [MultiPartParser]
+    
+    def post(self, request):
+        if getattr(request.user, 'user_type', None) != 'admin':
+            return Response({"error": "Only admins can bulk register users"}, status=status.HTTP_403_FORBIDDEN)
+        
+        upload = request.FILES.get('file')
+        role = request.data.get('role')
+        if upload is None or role not in ROLES:
+            return Response({"error": "A file and a role (student or lecturer) are required"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('format') or guess_format(upload.name)
+        if fmt not in FORMATS:
+            return Response({"error": "Unsupported file format"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        limit = settings.BULK_REGISTRATION_MAX_ROWS
+        try:
+            rows = list(islice(iter_rows(stream, fmt), limit + 1))
+        except ValueError as e:
+            return Response({"error": f"Could not parse file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > limit:
+            return Response({"error": f"At most {limit} rows per upload; use the import_users command for larger files"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        importer = BulkUserImporter(role, workers=settings.BULK_REGISTRATION_WORKERS, processes=False)
+        report = importer.run(rows)
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
+
+
 class LecturerRegistrationView(APIView):
     permission_classes = [AllowAny]
 
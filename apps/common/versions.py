@@ -0,0 +1,41 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'data-version:{}'
+
+
+def get_versions(*names):
+    """
+    Current version of each named data set, from the shared cache. Missing
+    versions start from the clock, so a flushed cache never brings back a
+    version that keys were already built from.
+    """
+    keys = {name: VERSION_KEY.format(name) for name in names}
+    found = cache.get_many(list(keys.values()))
+    versions = []
+    for name in names:
+        version = found.get(keys[name])
+        if version is None:
+            version = time.time_ns()
+            if not cache.add(keys[name], version, None):
+                version = cache.get(keys[name], version)
+        versions.append(version)
+    return tuple(versions)
+
+
+def increment_version(name):
+    """
+    Move ``name`` to a new version now and return it, or None if it wasn't
+    set (the next read starts a fresh one).
+    """
+    try:
+        return cache.incr(VERSION_KEY.format(name))
+    except ValueError:
+        return None
+
+
+def bump_version(name):
+    """Move ``name`` to a new version once the current transaction commits."""
+    transaction.on_commit(lambda: increment_version(name))
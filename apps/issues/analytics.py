@@ -0,0 +1,138 @@
+import datetime
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, F, Max, Sum
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from .models import Course, Issue, IssueStats, IssueStatsRefresh, User
+
+OPEN_STATUSES = ('pending', 'in_progress')
+BUCKET_FIELDS = ('course_id', 'assigned_to_id', 'status', 'priority')
+# Rows whose transaction was still open when a scan ran are caught by the next one
+RESCAN_OVERLAP = datetime.timedelta(minutes=5)
+COURSE_BATCH = 500
+
+
+def bucket_rows(issues):
+    """Aggregate ``issues`` into rollup buckets (dicts keyed like IssueStats columns)."""
+    return (
+        issues.order_by()
+        .values(*BUCKET_FIELDS)
+        .annotate(
+            issue_count=Count('pk'),
+            resolved_count=Count('resolved_at'),
+            # MySQL and SQLite subtract datetimes to microseconds; buckets with
+            # nothing resolved sum to NULL, which the rollup column doesn't allow
+            resolution_microseconds=Coalesce(
+                Sum(Cast(F('resolved_at') - F('created_at'), BigIntegerField())), 0,
+                output_field=BigIntegerField(),
+            ),
+        )
+    )
+
+
+def refresh_courses(course_ids):
+    """Recompute every bucket of the given courses from the issue table."""
+    course_ids = sorted(set(course_ids))
+    for start in range(0, len(course_ids), COURSE_BATCH):
+        batch = course_ids[start:start + COURSE_BATCH]
+        with transaction.atomic():
+            IssueStats.objects.filter(course_id__in=batch).delete()
+            IssueStats.objects.bulk_create([
+                IssueStats(**row) for row in bucket_rows(Issue.objects.filter(course_id__in=batch))
+            ])
+    return len(course_ids)
+
+
+def refresh_courses_on_commit(course_ids):
+    course_ids = [course_id for course_id in course_ids if course_id]
+    if course_ids:
+        transaction.on_commit(lambda: refresh_courses(course_ids))
+
+
+def refresh_changed():
+    """
+    Recompute the courses with issues updated since the last run. The scan
+    reads the ``(updated_at, id)`` index, so its cost follows the number of
+    changed rows rather than the size of the table. Deleted and moved issues
+    are handled by signals; ``rebuild`` covers writes made with
+    ``QuerySet.update()``.
+    """
+    started = timezone.now()
+    last = IssueStatsRefresh.objects.order_by('-scanned_through').first()
+    changed = Issue.objects.order_by()
+    if last is not None:
+        changed = changed.filter(updated_at__gte=last.scanned_through - RESCAN_OVERLAP)
+    courses = refresh_courses(changed.values_list('course_id', flat=True).distinct())
+    return IssueStatsRefresh.objects.create(scanned_through=started, courses=courses, full=last is None)
+
+
+def rebuild():
+    """Recompute every course."""
+    started = timezone.now()
+    courses = refresh_courses(Course.objects.values_list('pk', flat=True))
+    return IssueStatsRefresh.objects.create(scanned_through=started, courses=courses, full=True)
+
+
+def summarize(rows):
+    """
+    Fold bucket rows into the analytics payload. Works the same on rollup
+    rows and on ``bucket_rows`` computed live, which is how the rollup is
+    verified.
+    """
+    by_status = defaultdict(int)
+    by_priority = defaultdict(int)
+    by_course = defaultdict(int)
+    backlog = defaultdict(int)
+    total = resolved = resolution_microseconds = 0
+
+    for row in rows:
+        count = row['issue_count']
+        total += count
+        by_status[row['status']] += count
+        by_priority[row['priority']] += count
+        by_course[row['course_id']] += count
+        if row['status'] in OPEN_STATUSES:
+            backlog[row['assigned_to_id']] += count
+        resolved += row['resolved_count']
+        resolution_microseconds += int(row['resolution_microseconds'] or 0)
+
+    courses = dict(Course.objects.filter(pk__in=by_course).values_list('pk', 'course_code'))
+    users = User.objects.in_bulk([user_id for user_id in backlog if user_id])
+
+    return {
+        'total': total,
+        'by_status': {status: by_status[status] for status, _ in Issue.STATUS_CHOICES},
+        'by_priority': {priority: by_priority[priority] for priority, _ in Issue.PRIORITY_CHOICES},
+        'by_course': sorted(
+            ({'course': course_id, 'course_code': courses.get(course_id), 'count': count}
+             for course_id, count in by_course.items()),
+            key=lambda item: (-item['count'], item['course']),
+        ),
+        'resolved': resolved,
+        'mean_resolution_seconds': (
+            round(resolution_microseconds / resolved / 1e6, 1) if resolved else None
+        ),
+        'open_backlog': sorted(
+            ({'assigned_to': user_id,
+              'name': users[user_id].get_full_name() if user_id in users else None,
+              'open': count}
+             for user_id, count in backlog.items()),
+            key=lambda item: (-item['open'], item['assigned_to'] or 0),
+        ),
+    }
+
+
+def rollup_summary():
+    """Analytics from the rollup table; cost follows the number of buckets, not issues."""
+    rows = IssueStats.objects.values(*BUCKET_FIELDS, 'issue_count', 'resolved_count', 'resolution_microseconds')
+    summary = summarize(rows)
+    summary['refreshed_at'] = IssueStats.objects.aggregate(latest=Max('refreshed_at'))['latest']
+    return summary
+
+
+def reference_summary():
+    """The same analytics aggregated straight from the issue table."""
+    return summarize(bucket_rows(Issue.objects.all()))
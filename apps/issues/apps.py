@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class IssuesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.issues'
\ No newline at end of file
+    name = 'apps.issues'
+    
+    def ready(self):
+        # Register signal receivers
+        from . import siginals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,170 @@
+import mimetypes
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AttachmentJob, FileBlob
+
+KINDS = ('thumbnail', 'text')
+SUFFIXES = {'thumbnail': '.thumb.png', 'text': '.txt'}
+THUMBNAIL_SIZE = (320, 320)
+EXCERPT_CHARS = 1000
+TEXT_READ_LIMIT = 1024 * 1024
+
+
+class Unsupported(Exception):
+    """The file type (or the library needed for it) isn't available."""
+
+
+def artifact_name(source, kind):
+    """Derived files sit next to the original: ``<source>.thumb.png``, ``<source>.txt``."""
+    return source + SUFFIXES[kind]
+
+
+def enqueue(source):
+    """Queue every artefact of ``source``. Safe to repeat: one job per (source, kind)."""
+    if not source:
+        return
+    transaction.on_commit(lambda: AttachmentJob.objects.bulk_create(
+        [AttachmentJob(source=source, kind=kind) for kind in KINDS], ignore_conflicts=True,
+    ))
+
+
+def claim_jobs(batch_size):
+    """
+    Claim up to ``batch_size`` due jobs, leasing them like the mail outbox
+    does: a crashed worker's jobs come back once the lease runs out.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=settings.ATTACHMENT_JOB_LEASE)
+    with transaction.atomic():
+        jobs = list(
+            AttachmentJob.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if jobs:
+            AttachmentJob.objects.filter(pk__in=[job.pk for job in jobs]).update(next_attempt_at=now + lease)
+    return jobs
+
+
+def job_arguments(jobs):
+    """Plain, picklable work items for the process pool."""
+    content_types = dict(
+        FileBlob.objects.filter(file__in={job.source for job in jobs}).values_list('file', 'content_type')
+    )
+    return [
+        (job.kind, default_storage.path(job.source), default_storage.path(artifact_name(job.source, job.kind)),
+         content_types.get(job.source) or mimetypes.guess_type(job.source)[0] or '')
+        for job in jobs
+    ]
+
+
+def record_results(jobs, results):
+    now = timezone.now()
+    for job, (status, excerpt, error) in zip(jobs, results):
+        job.attempts += 1
+        job.error = error
+        if status == 'retry':
+            if job.attempts >= settings.ATTACHMENT_JOB_MAX_ATTEMPTS:
+                job.status = 'failed'
+            else:
+                job.next_attempt_at = now + timedelta(seconds=settings.ATTACHMENT_JOB_LEASE * job.attempts)
+        else:
+            job.status = status
+            job.excerpt = excerpt
+    AttachmentJob.objects.bulk_update(jobs, ['attempts', 'error', 'status', 'excerpt', 'next_attempt_at'])
+
+
+# Everything below runs in worker processes and touches no Django state.
+
+def run_job(kind, source_path, output_path, content_type=''):
+    """
+    Produce one artefact and return ``(status, excerpt, error)``. Output is
+    written to a temporary name and renamed into place, so a killed worker
+    never leaves a half-written artefact, and an artefact newer than its
+    source is reused rather than rebuilt.
+    """
+    try:
+        if not os.path.exists(source_path):
+            return 'failed', '', "Source file is missing"
+        current = (
+            os.path.exists(output_path)
+            and os.path.getmtime(output_path) >= os.path.getmtime(source_path)
+        )
+        if not current:
+            temporary = f'{output_path}.{os.getpid()}.tmp'
+            try:
+                if kind == 'thumbnail':
+                    make_thumbnail(source_path, temporary, content_type)
+                else:
+                    extract_text(source_path, temporary, content_type)
+                os.replace(temporary, output_path)
+            finally:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+        excerpt = ''
+        if kind == 'text':
+            with open(output_path, encoding='utf-8') as text:
+                excerpt = text.read(EXCERPT_CHARS)
+        return 'done', excerpt, ''
+    except Unsupported as e:
+        return 'unsupported', '', str(e)
+    except Exception as e:
+        return 'retry', '', f"{type(e).__name__}: {e}"
+
+
+def _is_pdf(path, content_type):
+    if content_type == 'application/pdf':
+        return True
+    with open(path, 'rb') as source:
+        return source.read(5) == b'%PDF-'
+
+
+def make_thumbnail(source_path, output_path, content_type):
+    try:
+        from PIL import Image
+    except ImportError:
+        raise Unsupported("Thumbnails need Pillow")
+
+    if _is_pdf(source_path, content_type):
+        try:
+            import pypdfium2
+        except ImportError:
+            raise Unsupported("PDF thumbnails need pypdfium2")
+        document = pypdfium2.PdfDocument(source_path)
+        try:
+            image = document[0].render(scale=1).to_pil()
+        finally:
+            document.close()
+    else:
+        try:
+            image = Image.open(source_path)
+            image.draft('RGB', THUMBNAIL_SIZE)  # Lets JPEG decode at reduced size
+        except Exception:
+            raise Unsupported("Not an image or PDF")
+
+    image.thumbnail(THUMBNAIL_SIZE)
+    if image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGB')
+    image.save(output_path, format='PNG')
+
+
+def extract_text(source_path, output_path, content_type):
+    if _is_pdf(source_path, content_type):
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise Unsupported("PDF text extraction needs pypdf")
+        with open(output_path, 'w', encoding='utf-8') as output:
+            for page in PdfReader(source_path).pages:
+                output.write((page.extract_text() or '') + '\n')
+    elif content_type.startswith('text/'):
+        with open(source_path, 'rb') as source, open(output_path, 'w', encoding='utf-8') as output:
+            output.write(source.read(TEXT_READ_LIMIT).decode('utf-8', errors='replace'))
+    else:
+        raise Unsupported("No text extractor for this file type")
@@ -0,0 +1,181 @@
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from apps.common.versions import get_versions, increment_version
+
+from .models import User
+
+VERSION = 'user-directory'
+RECORD_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'user_type')
+
+
+def normalize(text):
+    """Casefold and strip accents so "José" is found by "jose"."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def index_terms(record):
+    terms = {normalize(record['username']), normalize(record['email'])}
+    for name in ('first_name', 'last_name'):
+        terms.update(normalize(record[name]).split())
+    terms.discard('')
+    return terms
+
+
+def matches_token(token):
+    """The database version of a token matching some index term."""
+    condition = Q()
+    for field in ('username', 'email', 'first_name', 'last_name'):
+        condition |= Q(**{f'{field}__istartswith': token})
+    for field in ('first_name', 'last_name'):
+        # A later word of a multi-word name
+        condition |= Q(**{f'{field}__icontains': f' {token}'})
+    return condition
+
+
+class PrefixIndex:
+    """Sorted ``(term, user_id)`` pairs; a prefix lookup is one bisect."""
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, user_id, terms):
+        for term in terms:
+            insort(self.entries, (term, user_id))
+
+    def remove(self, user_id, terms):
+        for term in terms:
+            position = bisect_left(self.entries, (term, user_id))
+            if position < len(self.entries) and self.entries[position] == (term, user_id):
+                del self.entries[position]
+
+    def search(self, prefix):
+        position = bisect_left(self.entries, (prefix,))
+        while position < len(self.entries):
+            term, user_id = self.entries[position]
+            if not term.startswith(prefix):
+                break
+            yield user_id
+            position += 1
+
+
+class UserDirectory:
+    """
+    Process-local typeahead over active users, one prefix index per
+    user_type.
+
+    Saves and deletes are applied incrementally through signals. Every
+    change also bumps a version in the shared cache; a process that sees a
+    version it didn't produce itself rebuilds from one query, so workers
+    that missed the signal catch up on their next lookup. Queryset
+    ``update()``/``bulk_create`` bypass signals and only show up after
+    ``invalidate()``.
+
+    Without settings.SHARED_CACHE the versions never leave this process, so
+    a worker couldn't tell its copy is stale; lookups query the database
+    instead (same prefix rules, but without accent folding).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = None
+        self.records = {}
+        self.terms = {}
+        self.indexes = {}
+
+    def search(self, query, user_type=None, limit=10):
+        tokens = normalize(query).split()
+        if not tokens:
+            return []
+        if not settings.SHARED_CACHE:
+            return self.search_database(tokens, user_type, limit)
+        self.ensure_current()
+        with self._lock:
+            if user_type is None:
+                indexes = list(self.indexes.values())
+            else:
+                indexes = [self.indexes[user_type]] if user_type in self.indexes else []
+            # Scan the longest token's range, then require every other token
+            lead = max(tokens, key=len)
+            rest = [token for token in tokens if token is not lead]
+            results, seen = [], set()
+            for index in indexes:
+                for user_id in index.search(lead):
+                    if user_id in seen:
+                        continue
+                    seen.add(user_id)
+                    terms = self.terms[user_id]
+                    if all(any(term.startswith(token) for term in terms) for token in rest):
+                        results.append(self.records[user_id])
+                        if len(results) >= limit:
+                            return results
+            return results
+
+    def search_database(self, tokens, user_type, limit):
+        queryset = User.objects.filter(is_active=True)
+        if user_type is not None:
+            queryset = queryset.filter(user_type=user_type)
+        for token in tokens:
+            queryset = queryset.filter(matches_token(token))
+        return list(queryset.order_by('username').values(*RECORD_FIELDS)[:limit])
+
+    def ensure_current(self):
+        current = get_versions(VERSION)[0]
+        if current != self.version:
+            self.rebuild(current)
+
+    def rebuild(self, version):
+        # ``version`` was read before the load, so a change racing it triggers another rebuild
+        rows = User.objects.filter(is_active=True).values(*RECORD_FIELDS)
+        with self._lock:
+            self.records, self.terms, self.indexes = {}, {}, {}
+            for record in rows.iterator(chunk_size=2000):
+                self._add(record)
+            self.version = version
+
+    def _add(self, record):
+        terms = index_terms(record)
+        self.records[record['id']] = record
+        self.terms[record['id']] = terms
+        self.indexes.setdefault(record['user_type'], PrefixIndex()).add(record['id'], terms)
+
+    def _remove(self, user_id):
+        record = self.records.pop(user_id, None)
+        if record is not None:
+            self.indexes[record['user_type']].remove(user_id, self.terms.pop(user_id))
+
+    def apply(self, user_id, record=None):
+        """Replace (or, with no record, drop) one user and publish the change."""
+        version = increment_version(VERSION)
+        with self._lock:
+            if self.version is None or version is None or version != self.version + 1:
+                # Not built yet, or another process changed users meanwhile
+                self.version = None
+                return
+            self._remove(user_id)
+            if record is not None:
+                self._add(record)
+            self.version = version
+
+    def invalidate(self):
+        increment_version(VERSION)
+        with self._lock:
+            self.version = None
+
+
+directory = UserDirectory()
+
+
+def user_saved(user):
+    record = {field: getattr(user, field) for field in RECORD_FIELDS} if user.is_active else None
+    transaction.on_commit(lambda: directory.apply(user.pk, record))
+
+
+def user_deleted(user_id):
+    transaction.on_commit(lambda: directory.apply(user_id))
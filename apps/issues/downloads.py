@@ -0,0 +1,158 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from .models import FileBlob
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """
+    Read-only view of ``length`` bytes of a file starting at ``start``. It
+    has no ``fileno``, so WSGI servers stream it instead of sendfile()-ing
+    the whole file.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` for a single ``bytes=`` range, ``None`` to ignore the
+    header (absent, malformed or multi-range, which are served whole), or
+    ``False`` if the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def file_validators(name, path):
+    """
+    ``(etag, last_modified, size, blob)``. Blobs have a strong ETag from
+    their content hash; legacy attachments get a weak one from size and
+    mtime.
+    """
+    stat = os.stat(path)
+    blob = FileBlob.objects.filter(file=name).only('sha256', 'content_type').first()
+    etag = f'"{blob.sha256}"' if blob else f'W/"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+    return etag, int(stat.st_mtime), stat.st_size, blob
+
+
+def download_filename(name, blob, uploads=None):
+    """
+    The original filename from the upload attached to this issue or comment
+    (``uploads``), never from another user's upload of the same content;
+    otherwise the stored basename.
+    """
+    if blob is not None and uploads is not None:
+        filename = uploads.filter(blob=blob).order_by('-updated_at').values_list('filename', flat=True).first()
+        if filename:
+            return filename
+    return os.path.basename(name)
+
+
+def serve_attachment(request, name, uploads=None):
+    """
+    Serve the stored file ``name``, named after the matching record in
+    ``uploads``. Permission checks happen before this is called. Answers conditional
+    requests from the content hash, and then either hands the transfer to
+    the front proxy (ATTACHMENT_SENDFILE) or streams the file with
+    FileResponse, honouring a single HTTP Range.
+    """
+    if not name:
+        raise Http404("No attachment")
+    try:
+        path = default_storage.path(name)
+        etag, last_modified, size, blob = file_validators(name, path)
+    except (FileNotFoundError, NotImplementedError):
+        raise Http404("Attachment file is missing")
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response['ETag'] = etag
+        return response
+
+    content_type = (blob.content_type if blob else '') or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    mode = settings.ATTACHMENT_SENDFILE
+    if mode == 'x-accel':
+        # nginx serves the internal location, including Range requests
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.ATTACHMENT_ACCEL_PREFIX + quote(name)
+    elif mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        response = _file_response(request, path, size, etag, last_modified, content_type)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Content-Disposition'] = content_disposition_header(True, download_filename(name, blob, uploads))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _file_response(request, path, size, etag, last_modified, content_type):
+    byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if byte_range and if_range:
+        # Only a strong ETag or the exact date validates a partial response
+        current = (if_range == etag and not etag.startswith('W/')) or \
+            parse_http_date_safe(if_range) == last_modified
+        if not current:
+            # The client's copy is outdated: send everything
+            byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = open(path, 'rb')
+    if byte_range is None:
+        # A real file object: WSGI servers with wsgi.file_wrapper can sendfile() it
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFile(file, start, end - start + 1), content_type=content_type, status=206)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    return response
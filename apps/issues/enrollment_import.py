@@ -0,0 +1,135 @@
+import time
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, connection, transaction
+
+from apps.common.versions import bump_version
+
+from .models import User, Course, Enrollment
+
+KEY_FIELDS = ('student', 'course', 'semester', 'academic_year')
+# Plain columns validated with the model's own field rules
+CLEANED_FIELDS = ('semester', 'academic_year', 'current_grade')
+
+
+class EnrollmentLoader:
+    """
+    Upserts registrar enrollment exports in chunks.
+
+    Course codes resolve through a map loaded once (the course table is
+    small); student usernames resolve per chunk into a map that only grows
+    with distinct students, so memory stays bounded by the database rather
+    than the input file. Each chunk is one upsert in its own transaction and
+    produces one progress record. Existing grades are only overwritten by
+    rows that carry one; a chunk the database rejects is reported as an
+    error and the load carries on.
+    """
+
+    def __init__(self, chunk_size=5000):
+        self.chunk_size = chunk_size
+        self.course_ids = dict(Course.objects.values_list('course_code', 'pk'))
+        self.student_ids = {}
+        self.processed = 0
+        self.upserted = 0
+        self.failed = 0
+
+    def load(self, rows):
+        """Yield a progress dict per chunk, then a final summary."""
+        start = time.perf_counter()
+        numbered = enumerate(rows, start=1)
+        chunk_number = 0
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            chunk_number += 1
+            errors = self.load_chunk(chunk)
+            yield self.progress(start, chunk=chunk_number, errors=errors)
+        yield self.progress(start, done=True)
+
+    def progress(self, start, **extra):
+        elapsed = time.perf_counter() - start
+        return {
+            'processed': self.processed,
+            'upserted': self.upserted,
+            'failed': self.failed,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(self.processed / elapsed, 1) if elapsed else None,
+            **extra,
+        }
+
+    def resolve_students(self, usernames):
+        missing = set(usernames) - self.student_ids.keys()
+        if missing:
+            self.student_ids.update(
+                User.objects.filter(username__in=missing, user_type='student')
+                .values_list('username', 'pk')
+            )
+
+    def load_chunk(self, chunk):
+        self.processed += len(chunk)
+        self.resolve_students(
+            str(row['student']) for _, row in chunk if isinstance(row, dict) and row.get('student')
+        )
+
+        errors = []
+        # Keyed on the unique fields so repeated rows in a chunk collapse to the last one
+        enrollments = {}
+        for line, row in chunk:
+            enrollment, error = self.build(row)
+            if error:
+                errors.append({'row': line, 'error': error})
+                continue
+            key = (enrollment.student_id, enrollment.course_id, enrollment.semester, enrollment.academic_year)
+            enrollments[key] = enrollment
+
+        self.failed += len(errors)
+        graded = [e for e in enrollments.values() if e.current_grade is not None]
+        # No grade in the input: create the enrollment, leave an existing one alone
+        ungraded = [e for e in enrollments.values() if e.current_grade is None]
+        if enrollments:
+            options = {'update_conflicts': True, 'update_fields': ['current_grade']}
+            if connection.features.supports_update_conflicts_with_target:
+                options['unique_fields'] = list(KEY_FIELDS)
+            try:
+                with transaction.atomic():
+                    if graded:
+                        Enrollment.objects.bulk_create(graded, **options)
+                    if ungraded:
+                        Enrollment.objects.bulk_create(ungraded, ignore_conflicts=True)
+                    # bulk_create sends no signals
+                    bump_version('enrollment')
+            except (IntegrityError, DataError) as e:
+                # Same shape as a row error; 'row' names the chunk's line range
+                errors.append({'row': f"{chunk[0][0]}-{chunk[-1][0]}", 'error': f"Chunk not loaded: {e}"})
+                self.failed += len(enrollments)
+            else:
+                self.upserted += len(enrollments)
+        return errors
+
+    def build(self, row):
+        if not isinstance(row, dict):
+            return None, "Row is not an object"
+        missing = [field for field in KEY_FIELDS if not row.get(field)]
+        if missing:
+            return None, f"Missing {', '.join(missing)}"
+
+        student_id = self.student_ids.get(str(row['student']))
+        if student_id is None:
+            return None, f"Unknown student: {row['student']}"
+        course_id = self.course_ids.get(str(row['course']))
+        if course_id is None:
+            return None, f"Unknown course: {row['course']}"
+
+        values = {}
+        for name in CLEANED_FIELDS:
+            value = row.get(name)
+            if value == '':
+                value = None
+            try:
+                values[name] = Enrollment._meta.get_field(name).clean(value, None)
+            except ValidationError as e:
+                return None, f"Invalid {name}: {' '.join(e.messages)}"
+
+        return Enrollment(student_id=student_id, course_id=course_id, **values), None
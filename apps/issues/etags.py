@@ -0,0 +1,40 @@
+import hashlib
+
+from django.conf import settings
+
+from apps.common.versions import bump_version, get_versions
+
+from .notifications import get_unread_count
+
+LIST_VERSION = 'issue-list'
+
+
+def get_list_version():
+    """
+    Version of everything the issue list shows, bumped on any change to
+    issues, comments, courses, categories or users.
+    """
+    return get_versions(LIST_VERSION)[0]
+
+
+def bump_list_version():
+    bump_version(LIST_VERSION)
+
+
+def issue_list_etag(request):
+    """
+    ETag for one user's view of the issue list with the request's query
+    parameters. Built from cached values only, so a matching If-None-Match
+    is answered without touching the issue tables. The unread counter
+    covers the per-user ``has_unread`` flag.
+
+    Returns None without a shared cache: another worker's writes would
+    never reach this process's counters, so its ETags would stay valid
+    over stale data.
+    """
+    if not settings.SHARED_CACHE:
+        return None
+    count, modified = get_unread_count(request.user.pk)
+    params = sorted(request.query_params.lists())
+    key = repr((get_list_version(), request.user.pk, count, modified, params))
+    return '"%s"' % hashlib.md5(key.encode()).hexdigest()
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+
+
+class Subscription:
+    """
+    One connected client: an asyncio queue bound to the event loop that
+    serves the connection.
+    """
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        # Publishers run in worker threads; hand the event to the loop.
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Loop already closed; the connection is going away
+            pass
+
+    def _put(self, event):
+        if self.queue.full():
+            # Slow consumer: drop the oldest event rather than block publishers
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+
+class EventHub:
+    """
+    In-process pub/sub fanning events out to per-user subscriptions.
+
+    Idle connections are just a queue waiting in the event loop, so
+    thousands of them cost no threads. Events only reach clients connected
+    to this process; a multi-process deployment needs a shared broker.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+hub = EventHub()
+
+
+def publish_on_commit(user_ids, event_type, data):
+    """Push an event to the given users once the current transaction commits."""
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+    event = {'type': event_type, 'data': data}
+
+    def publish():
+        for user_id in user_ids:
+            hub.publish(user_id, event)
+    transaction.on_commit(publish)
@@ -0,0 +1,124 @@
+import csv
+import json
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.decorators import action
+
+from .filtering import parse_moment
+
+EXPORT_CHUNK_SIZE = 2000
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def iter_chunks(queryset, columns, date_field, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of ``values_list`` rows ordered by ``(date_field, id)``.
+
+    Each chunk is its own ``LIMIT`` query seeking past the last row of the
+    previous one along the ``(date_field, id)`` index. mysqlclient buffers a
+    whole result set client-side, so one big ``.iterator()`` query would
+    not keep memory flat on MySQL; this does, on every backend.
+    """
+    date_index, id_index = columns.index(date_field), columns.index('id')
+    queryset = queryset.order_by(date_field, 'pk').values_list(*columns)
+    page = queryset
+    while True:
+        rows = list(page[:chunk_size])
+        if rows:
+            yield rows
+        if len(rows) < chunk_size:
+            return
+        last_date, last_id = rows[-1][date_index], rows[-1][id_index]
+        page = queryset.filter(
+            Q(**{f'{date_field}__gt': last_date}) | Q(**{date_field: last_date, 'pk__gt': last_id})
+        )
+
+
+class _Echo:
+    """File-like object handing csv.writer output straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def csv_stream(columns, chunks):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for rows in chunks:
+        yield ''.join(writer.writerow([_csv_value(value) for value in row]) for row in rows)
+
+
+def ndjson_stream(columns, chunks):
+    for rows in chunks:
+        yield ''.join(json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n' for row in rows)
+
+
+STREAMS = {'csv': csv_stream, 'ndjson': ndjson_stream}
+
+
+class StreamingExportMixin:
+    """
+    Adds ``GET <list>/export/`` streaming every visible row as CSV or NDJSON
+    (``?output=csv|ndjson``), optionally narrowed with ``?issue=``,
+    ``?created_after=`` and ``?created_before=``.
+
+    Rows come from ``values_list`` over ``export_columns``; no model
+    instances or serializers are involved, so memory stays at one chunk
+    regardless of the export size.
+    """
+    export_name = None
+    export_columns = ()
+    # Column ranged by created_after/created_before; also the export order
+    export_date_field = 'created_at'
+    export_issue_field = 'issue_id'
+
+    def get_export_queryset(self):
+        return self.get_base_queryset()
+
+    def filter_export_queryset(self, queryset):
+        params = self.request.query_params
+        lookups = {}
+        errors = {}
+        issue_id = params.get('issue')
+        if issue_id:
+            if issue_id.isdecimal():
+                lookups[self.export_issue_field] = int(issue_id)
+            else:
+                errors['issue'] = ["Expected an id"]
+        for name, lookup in (('created_after', 'gte'), ('created_before', 'lt')):
+            if not params.get(name):
+                continue
+            moment = parse_moment(params[name])
+            if moment is None:
+                errors[name] = ["Expected an ISO date or datetime"]
+            else:
+                lookups[f'{self.export_date_field}__{lookup}'] = moment
+        if errors:
+            raise exceptions.ValidationError(errors)
+        return queryset.filter(**lookups)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        output = request.query_params.get('output', 'csv')
+        if output not in STREAMS:
+            raise exceptions.ValidationError({'output': [f"Must be one of: {', '.join(STREAMS)}"]})
+
+        queryset = self.filter_export_queryset(self.get_export_queryset())
+        columns = list(self.export_columns)
+        chunks = iter_chunks(queryset, columns, self.export_date_field)
+        response = StreamingHttpResponse(STREAMS[output](columns, chunks), content_type=CONTENT_TYPES[output])
+        filename = f"{self.export_name}-{timezone.now():%Y%m%d-%H%M%S}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
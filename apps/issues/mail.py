@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+
+def queue_mail(subject, message, recipient_list, from_email=None):
+    """
+    Queue an email in the outbox instead of talking to SMTP in the request.
+
+    The row is written in the caller's transaction, so it only becomes
+    visible to the outbox worker once that transaction commits.
+    """
+    recipients = [recipient for recipient in recipient_list if recipient]
+    if not recipients:
+        return None
+    return EmailOutbox.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=recipients,
+    )
+
+
+def claim_batch(batch_size):
+    """
+    Claim up to ``batch_size`` due messages.
+
+    Claimed rows get their ``next_attempt_at`` pushed out by the lease, so
+    concurrent workers skip them and a crashed worker's rows come back on
+    their own once the lease expires.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if rows:
+            EmailOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(next_attempt_at=now + lease)
+    return rows
+
+
+def _record_failure(row, error, now):
+    row.attempts += 1
+    row.last_error = str(error)
+    if row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        row.status = 'dead'
+    else:
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (row.attempts - 1)
+        row.next_attempt_at = now + timedelta(seconds=delay)
+
+
+def deliver_batch(rows):
+    """
+    Send ``rows`` over a single SMTP connection and record the outcome.
+
+    Returns ``(sent, failed)`` counts. Failed rows are retried with
+    exponential backoff and dead-lettered after EMAIL_OUTBOX_MAX_ATTEMPTS.
+    """
+    connection = get_connection()
+    now = timezone.now()
+    try:
+        connection.open()
+    except Exception as e:
+        for row in rows:
+            _record_failure(row, e, now)
+        EmailOutbox.objects.bulk_update(rows, ['attempts', 'last_error', 'status', 'next_attempt_at'])
+        return 0, len(rows)
+
+    sent, failed = [], []
+    try:
+        for row in rows:
+            try:
+                EmailMessage(
+                    subject=row.subject,
+                    body=row.message,
+                    from_email=row.from_email,
+                    to=row.recipients,
+                    connection=connection,
+                ).send()
+            except Exception as e:
+                _record_failure(row, e, now)
+                failed.append(row)
+            else:
+                row.attempts += 1
+                row.status = 'sent'
+                row.sent_at = timezone.now()
+                sent.append(row)
+    finally:
+        connection.close()
+
+    EmailOutbox.objects.bulk_update(
+        sent + failed, ['attempts', 'last_error', 'status', 'next_attempt_at', 'sent_at']
+    )
+    return len(sent), len(failed)
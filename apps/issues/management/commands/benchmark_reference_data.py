@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework import serializers
+
+from apps.issues.models import Course, Enrollment, Issue
+from apps.issues.query_planning import plan_queryset
+from apps.issues.reference_data import reference_data
+from apps.issues.serializers import CourseSerializer, EnrollmentSerializer, IssueSerializer
+
+
+class IssueRowSerializer(IssueSerializer):
+    """The reference columns of the issue list, without the per-user annotations."""
+    comments = None
+    attachment_previews = None
+
+    class Meta(IssueSerializer.Meta):
+        fields = ['id', 'title', 'status', 'priority', 'course', 'course_code', 'course_name',
+                  'category', 'category_name']
+
+
+# The same serializers with names joined into the query, as before the cache
+class JoinedCourseSerializer(CourseSerializer):
+    lecturer_name = serializers.SerializerMethodField()
+
+    class Meta(CourseSerializer.Meta):
+        select_related_hints = ('lecturer',)
+
+    def get_lecturer_name(self, obj):
+        if obj.lecturer:
+            return f"{obj.lecturer.first_name} {obj.lecturer.last_name}"
+        return None
+
+
+class JoinedEnrollmentSerializer(EnrollmentSerializer):
+    course_code = serializers.CharField(source='course.course_code', read_only=True)
+    course_name = serializers.CharField(source='course.course_name', read_only=True)
+
+
+class JoinedIssueRowSerializer(IssueRowSerializer):
+    course_code = serializers.CharField(source='course.course_code', read_only=True)
+    course_name = serializers.CharField(source='course.course_name', read_only=True)
+    category_name = serializers.CharField(source='category.name', read_only=True)
+
+
+class Command(BaseCommand):
+    help = "Compare list serialization with joined course/category names and with the reference data cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help="Rows per list.")
+        parser.add_argument('--repeat', type=int, default=50, help="Serializations per variant.")
+
+    # Without it reference fields fall back to joins and both variants measure the same thing
+    @override_settings(SHARED_CACHE=True)
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        reference_data.clear()
+        snapshot = reference_data.current()
+        self.stdout.write(f"reference data loaded in {(time.perf_counter() - start) * 1000:.1f} ms "
+                          f"({len(snapshot.tables['course'])} courses, "
+                          f"{len(snapshot.tables['category'])} categories)")
+
+        lists = {
+            'courses': (Course, JoinedCourseSerializer, CourseSerializer),
+            'enrollments': (Enrollment, JoinedEnrollmentSerializer, EnrollmentSerializer),
+            'issues': (Issue, JoinedIssueRowSerializer, IssueRowSerializer),
+        }
+        rows, repeat = options['rows'], options['repeat']
+        for name, (model, joined, cached) in lists.items():
+            for variant, serializer_class in (('joined', joined), ('cached', cached)):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    for _ in range(repeat):
+                        queryset = plan_queryset(model.objects.order_by('pk'), serializer_class)[:rows]
+                        data = serializer_class(queryset, many=True).data
+                    elapsed = (time.perf_counter() - start) / repeat
+                self.stdout.write(
+                    f"{name:<12} {variant:<7} {elapsed * 1000:8.2f} ms/list  "
+                    f"{len(queries) / repeat:.1f} queries/list  {len(data)} rows"
+                )
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from apps.issues.models import User
+from apps.issues.search import fulltext_enabled, rank_issues, search_issues
+from apps.issues.visibility import visible_issues
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the previous LIKE-based issue search with the full-text "
+        "search path for a set of query terms on the current database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('terms', nargs='+', help="Queries to run, e.g. \"missing mark\".")
+        parser.add_argument('--user', help="Username to scope the search to (defaults to an admin).")
+        parser.add_argument('--repeat', type=int, default=20,
+                            help="Runs per query and variant.")
+        parser.add_argument('--page-size', type=int, default=10,
+                            help="Rows fetched per query, as on a list page.")
+        parser.add_argument('--explain', action='store_true',
+                            help="Print the query plan of each variant for the first query.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(username=options['user']) if options['user'] else \
+            User.objects.filter(user_type='admin')
+        user = users.first()
+        if user is None:
+            self.stdout.write("No matching user found; seed some data first.")
+            return
+        if not fulltext_enabled():
+            self.stdout.write(f"{connection.vendor} has no FULLTEXT support; the search path falls back to LIKE")
+
+        page_size = options['page_size']
+        base = visible_issues(user)
+        self.stdout.write(f"{base.count()} issues visible to {user.username}")
+
+        for index, query in enumerate(options['terms']):
+            variants = {
+                # What SearchFilter generated for search_fields = title, description, status
+                'like': base.filter(
+                    Q(title__icontains=query) | Q(description__icontains=query) | Q(status__icontains=query)
+                ).order_by('-created_at', '-id'),
+                'fulltext': search_issues(base, query).order_by('-created_at', '-id'),
+                'ranked': rank_issues(base, query),
+            }
+            for name, queryset in variants.items():
+                if options['explain'] and index == 0:
+                    self.stdout.write(f"--- {name} ---\n{queryset[:page_size].explain()}")
+                start = time.perf_counter()
+                for _ in range(options['repeat']):
+                    rows = list(queryset.values_list('pk', flat=True)[:page_size])
+                elapsed = (time.perf_counter() - start) / options['repeat']
+                self.stdout.write(f"{query!r:<24} {name:<10} {elapsed * 1000:8.2f} ms/query  {len(rows)} rows")
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.test.utils import override_settings
+
+from apps.issues.directory import directory
+from apps.issues.models import User
+
+
+class Command(BaseCommand):
+    help = "Compare the SearchFilter icontains user lookup with the in-memory typeahead directory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('prefixes', nargs='+', help="Partial names to look up, e.g. jo kat.")
+        parser.add_argument('--user-type', choices=[choice for choice, _ in User.USER_TYPE_CHOICES])
+        parser.add_argument('--repeat', type=int, default=200,
+                            help="Lookups per prefix and variant.")
+        parser.add_argument('--limit', type=int, default=10)
+
+    # Without it the directory answers from the database
+    @override_settings(SHARED_CACHE=True)
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        directory.ensure_current()
+        self.stdout.write(f"directory built in {(time.perf_counter() - start) * 1000:.1f} ms "
+                          f"({len(directory.records)} active users)")
+
+        limit, repeat = options['limit'], options['repeat']
+        for prefix in options['prefixes']:
+            # What SearchFilter generated for search_fields = username, email, first_name, last_name
+            queryset = User.objects.filter(
+                Q(username__icontains=prefix) | Q(email__icontains=prefix)
+                | Q(first_name__icontains=prefix) | Q(last_name__icontains=prefix)
+            )
+            if options['user_type']:
+                queryset = queryset.filter(user_type=options['user_type'])
+            variants = {
+                'icontains': lambda: list(queryset.values('id', 'username')[:limit]),
+                'directory': lambda: directory.search(prefix, options['user_type'], limit),
+            }
+            for name, lookup in variants.items():
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    rows = lookup()
+                elapsed = (time.perf_counter() - start) / repeat
+                self.stdout.write(f"{prefix!r:<16} {name:<10} {elapsed * 1e6:9.1f} us/lookup  {len(rows)} rows")
@@ -0,0 +1,70 @@
+import hashlib
+import os
+import time
+import tracemalloc
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.issues.models import FileBlob, User
+from apps.issues.uploads import append_chunk, start_upload
+
+
+class PatternStream:
+    """Deterministic pseudo-random bytes produced on read, never held whole."""
+
+    def __init__(self, seed, length):
+        self.block = hashlib.sha256(seed.encode()).digest() * 2048
+        self.remaining = length
+
+    def read(self, size):
+        size = min(size, self.remaining, len(self.block))
+        self.remaining -= size
+        return self.block[:size]
+
+
+class Command(BaseCommand):
+    help = (
+        "Push a synthetic file through the chunked upload path and report "
+        "peak Python memory and bytes written to disk per byte uploaded "
+        "(1.00 means every byte was written once, with no copies)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=50)
+        parser.add_argument('--chunk-mb', type=int, default=4)
+        parser.add_argument('--keep', action='store_true', help="Keep the stored blob afterwards.")
+
+    def handle(self, *args, **options):
+        user = User.objects.first()
+        if user is None:
+            raise CommandError("No users found; seed some data first.")
+        size = options['size_mb'] * 1024 * 1024
+        chunk = options['chunk_mb'] * 1024 * 1024
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        upload = start_upload(user.pk, 'benchmark.bin', size)
+        stream = PatternStream(str(upload.pk), size)
+        written = offset = 0
+        while offset < size:
+            length = min(chunk, size - offset)
+            upload, count = append_chunk(
+                upload.pk, user.pk, stream, f'bytes {offset}-{offset + length - 1}/{size}'
+            )
+            written += count
+            offset += length
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        blob = upload.blob
+        self.stdout.write(
+            f"{size / 1e6:.1f} MB in {elapsed:.2f}s ({size / 1e6 / elapsed:.1f} MB/s), "
+            f"peak {peak / 1e6:.2f} MB, disk writes {written / size:.2f}x, "
+            f"stored as {blob.file.name} ({os.path.getsize(default_storage.path(blob.file.name))} bytes)"
+        )
+        if not options['keep'] and not blob.uploads.exclude(pk=upload.pk).exists():
+            default_storage.delete(blob.file.name)
+            FileBlob.objects.filter(pk=blob.pk).delete()
+        upload.delete()
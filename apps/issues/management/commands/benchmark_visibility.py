@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from apps.issues.models import Issue, User
+from apps.issues.visibility import visible_issues
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the legacy OR + DISTINCT lecturer visibility query with the "
+        "shared visibility plan on the current database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lecturers', type=int, default=20,
+                            help="Number of lecturers to sample.")
+        parser.add_argument('--page-size', type=int, default=10,
+                            help="Rows fetched per query, as on a list page.")
+        parser.add_argument('--explain', action='store_true',
+                            help="Print the query plan of both variants for the first lecturer.")
+
+    def handle(self, *args, **options):
+        lecturers = list(User.objects.filter(user_type='lecturer')[:options['lecturers']])
+        if not lecturers:
+            self.stdout.write("No lecturers found; seed some data first.")
+            return
+
+        self.stdout.write(f"{Issue.objects.count()} issues, {len(lecturers)} lecturers sampled")
+        page_size = options['page_size']
+        totals = {'legacy': 0.0, 'visibility': 0.0}
+
+        for index, lecturer in enumerate(lecturers):
+            variants = {
+                'legacy': Issue.objects.filter(
+                    Q(course__lecturer=lecturer) | Q(assigned_to=lecturer)
+                ).distinct(),
+                'visibility': visible_issues(lecturer),
+            }
+            pages = {}
+            for name, queryset in variants.items():
+                queryset = queryset.order_by('-created_at', '-id')
+                if options['explain'] and index == 0:
+                    self.stdout.write(f"--- {name} ---\n{queryset[:page_size].explain()}")
+                start = time.perf_counter()
+                pages[name] = list(queryset.values_list('pk', flat=True)[:page_size])
+                totals[name] += time.perf_counter() - start
+            if pages['legacy'] != pages['visibility']:
+                self.stderr.write(f"Result mismatch for lecturer {lecturer.pk}")
+
+        for name, total in totals.items():
+            self.stdout.write(f"{name:<12} {total / len(lecturers) * 1000:8.2f} ms/query ({connection.vendor})")
@@ -0,0 +1,80 @@
+import json
+from itertools import combinations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.issues.models import Issue
+from apps.issues.pagination import IssueCursorPagination
+
+# Filter name -> queryset lookup built from a sample issue, as IssueFilter does
+FILTERS = {
+    'status': lambda issue: {'status': issue.status},
+    'priority': lambda issue: {'priority': issue.priority},
+    'course': lambda issue: {'course_id': issue.course_id},
+    'category': lambda issue: {'category_id': issue.category_id},
+    'assigned_to': lambda issue: {'assigned_to__isnull': True} if issue.assigned_to_id is None
+    else {'assigned_to_id': issue.assigned_to_id},
+    'created_after': lambda issue: {'created_at__gte': issue.created_at},
+}
+
+
+def full_scans(plan, table):
+    """Yield the entries of a MySQL JSON plan that read ``table`` without an index."""
+    if isinstance(plan, dict):
+        if plan.get('table_name') == table and plan.get('access_type') == 'ALL':
+            yield plan
+        for value in plan.values():
+            yield from full_scans(value, table)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from full_scans(value, table)
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every combination of issue list filters under every allowed "
+        "ordering and fail if any of them scans the issue table without an "
+        "index. Run it against a database with representative data; on tiny "
+        "tables the optimizer legitimately prefers a scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-filters', type=int, default=len(FILTERS),
+                            help="Largest number of filters combined in one query.")
+        parser.add_argument('--page-size', type=int, default=IssueCursorPagination.page_size)
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help="Print every plan, not just the failing ones.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'mysql':
+            raise CommandError("Plan checks read MySQL's JSON EXPLAIN output; run against MySQL.")
+        sample = Issue.objects.order_by('-created_at').first()
+        if sample is None:
+            raise CommandError("No issues found; seed some data first.")
+
+        orderings = [IssueCursorPagination.ordering] + [
+            IssueCursorPagination.resolve_ordering(direction + field)
+            for field in IssueCursorPagination.ordering_fields for direction in ('', '-')
+        ]
+        table = Issue._meta.db_table
+        checked, failures = 0, []
+        for size in range(options['max_filters'] + 1):
+            for names in combinations(FILTERS, size):
+                lookups = {}
+                for name in names:
+                    lookups.update(FILTERS[name](sample))
+                for ordering in orderings:
+                    queryset = Issue.objects.filter(**lookups).order_by(*ordering)[:options['page_size'] + 1]
+                    plan = queryset.explain(format='json')
+                    checked += 1
+                    label = f"filters={','.join(names) or '-'} ordering={ordering[0]}"
+                    if list(full_scans(json.loads(plan), table)):
+                        failures.append(label)
+                        self.stdout.write(f"FULL SCAN {label}\n{plan}")
+                    elif options['verbose_plans']:
+                        self.stdout.write(f"ok {label}\n{plan}")
+
+        self.stdout.write(f"{checked} plans checked, {len(failures)} full scans")
+        if failures:
+            raise CommandError(f"{len(failures)} filter/ordering combinations scan {table}")
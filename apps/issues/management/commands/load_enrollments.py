@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.authentication.bulk_import import FORMATS, guess_format, iter_rows
+from apps.issues.enrollment_import import EnrollmentLoader
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert enrollments from a registrar export (CSV, JSON or JSON Lines) "
+        "with student, course, semester, academic_year and current_grade columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS,
+                            help="File format (guessed from the extension by default).")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or guess_format(options['path'])
+        if fmt is None:
+            raise CommandError("Cannot guess the file format; pass --format.")
+
+        loader = EnrollmentLoader(options['chunk_size'])
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            for progress in loader.load(iter_rows(stream, fmt)):
+                for error in progress.get('errors', ()):
+                    self.stderr.write(f"row {error['row']}: {error['error']}")
+                self.stdout.write(
+                    f"{progress['processed']} rows, {progress['upserted']} upserted, "
+                    f"{progress['failed']} failed ({progress['rows_per_second']} rows/s)"
+                )
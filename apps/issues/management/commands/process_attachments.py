@@ -0,0 +1,74 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.issues.artifacts import claim_jobs, enqueue, job_arguments, record_results, run_job
+from apps.issues.models import AttachmentJob, Comment, Issue
+
+
+def _run(arguments):
+    return run_job(*arguments)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate thumbnails and extract text for queued attachments with a "
+        "process pool, then report throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes.")
+        parser.add_argument('--batch-size', type=int, default=32,
+                            help="Jobs claimed per round trip to the database.")
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help="Seconds to sleep between polls when no job is due.")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain the queue once and exit instead of polling.")
+        parser.add_argument('--backfill', action='store_true',
+                            help="Queue jobs for every existing issue and comment attachment first.")
+        parser.add_argument('--redo', action='store_true',
+                            help="Reset finished jobs to pending (e.g. after installing Pillow or "
+                                 "to benchmark); existing artefacts are still reused.")
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            sources = set(Issue.objects.exclude(attachments='').exclude(attachments__isnull=True)
+                          .values_list('attachments', flat=True))
+            sources |= set(Comment.objects.exclude(attachment='').exclude(attachment__isnull=True)
+                           .values_list('attachment', flat=True))
+            for source in sources:
+                enqueue(source)
+            self.stdout.write(f"Queued artefacts for {len(sources)} attachments")
+        if options['redo']:
+            reset = AttachmentJob.objects.exclude(status='pending').update(status='pending', attempts=0, error='')
+            self.stdout.write(f"Reset {reset} jobs")
+
+        workers = max(1, options['workers'])
+        batch_size = max(1, options['batch_size'])
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                start = time.perf_counter()
+                counts = self.drain(pool, batch_size)
+                elapsed = time.perf_counter() - start
+                total = sum(counts.values())
+                if total:
+                    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items()))
+                    self.stdout.write(f"{total} jobs in {elapsed:.2f}s ({total / elapsed:.1f} jobs/s): {summary}")
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+
+    def drain(self, pool, batch_size):
+        """Claim and run batches until nothing is due; returns counts per outcome."""
+        counts = {}
+        while True:
+            jobs = claim_jobs(batch_size)
+            if not jobs:
+                return counts
+            results = list(pool.map(_run, job_arguments(jobs)))
+            record_results(jobs, results)
+            for status, _, _ in results:
+                counts[status] = counts.get(status, 0) + 1
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from apps.issues.uploads import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete partial chunked uploads idle for longer than CHUNKED_UPLOAD_EXPIRY."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Purged {purge_stale_uploads()} stale uploads")
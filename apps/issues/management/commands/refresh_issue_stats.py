@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.issues.analytics import rebuild, reference_summary, refresh_changed, rollup_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the issue stats rollup from issues changed since the last "
+        "run. Schedule it every few minutes (cron, systemd timer, ...)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help="Recompute every course instead of only changed ones.")
+        parser.add_argument('--verify', action='store_true',
+                            help="Compare the rollup with an aggregate of the issue table afterwards.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        run = rebuild() if options['full'] else refresh_changed()
+        self.stdout.write(
+            f"Refreshed {run.courses} courses through {run.scanned_through:%Y-%m-%d %H:%M:%S} "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+        if not options['verify']:
+            return
+
+        start = time.perf_counter()
+        rollup = rollup_summary()
+        rollup_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        reference = reference_summary()
+        reference_seconds = time.perf_counter() - start
+        rollup.pop('refreshed_at')
+        self.stdout.write(f"rollup {rollup_seconds * 1000:.1f} ms, reference {reference_seconds * 1000:.1f} ms")
+        mismatched = [key for key in reference if reference[key] != rollup[key]]
+        if mismatched:
+            raise CommandError(f"Rollup differs from the issue table in: {', '.join(mismatched)}")
+        self.stdout.write("Rollup matches the issue table")
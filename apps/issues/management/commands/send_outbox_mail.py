@@ -0,0 +1,51 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.issues.mail import claim_batch, deliver_batch
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox email with a pool of workers, one SMTP connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4,
+                            help="Number of concurrent delivery workers.")
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help="Messages sent per SMTP connection.")
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help="Seconds to sleep between polls when the outbox is empty.")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain the outbox once and exit instead of polling.")
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        batch_size = max(1, options['batch_size'])
+
+        while True:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda _: self.drain(batch_size), range(workers)))
+            sent = sum(result[0] for result in results)
+            failed = sum(result[1] for result in results)
+            if sent or failed:
+                self.stdout.write(f"Outbox: {sent} sent, {failed} failed")
+            if options['once']:
+                return
+            time.sleep(options['interval'])
+
+    def drain(self, batch_size):
+        """Claim and deliver batches until nothing is due."""
+        sent = failed = 0
+        try:
+            while True:
+                rows = claim_batch(batch_size)
+                if not rows:
+                    return sent, failed
+                batch_sent, batch_failed = deliver_batch(rows)
+                sent += batch_sent
+                failed += batch_failed
+        finally:
+            # Each worker thread owns its own database connection.
+            connection.close()
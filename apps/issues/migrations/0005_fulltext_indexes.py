@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# table -> (index name, columns). InnoDB keeps FULLTEXT indexes current on
+# every write, so nothing else has to sync them.
+FULLTEXT_INDEXES = {
+    'issues_issue': ('issue_fulltext_idx', ('title', 'description')),
+    'issues_comment': ('comment_fulltext_idx', ('content',)),
+}
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    # Django has no portable FULLTEXT index; other backends use the LIKE fallback
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    quote = schema_editor.quote_name
+    for table, (name, columns) in FULLTEXT_INDEXES.items():
+        schema_editor.execute(
+            f"ALTER TABLE {quote(table)} ADD FULLTEXT INDEX {quote(name)} "
+            f"({', '.join(quote(column) for column in columns)})"
+        )
+
+
+def remove_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    quote = schema_editor.quote_name
+    for table, (name, _) in FULLTEXT_INDEXES.items():
+        schema_editor.execute(f"ALTER TABLE {quote(table)} DROP INDEX {quote(name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0004_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_indexes, remove_fulltext_indexes),
+    ]
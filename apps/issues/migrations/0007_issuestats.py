@@ -0,0 +1,43 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0006_issue_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('rejected', 'Rejected')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], max_length=10)),
+                ('issue_count', models.PositiveIntegerField(default=0)),
+                ('resolved_count', models.PositiveIntegerField(default=0)),
+                ('resolution_microseconds', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='issues.user')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='issues.course')),
+            ],
+            options={
+                'verbose_name_plural': 'Issue stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='IssueStatsRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scanned_through', models.DateTimeField()),
+                ('courses', models.PositiveIntegerField(default=0)),
+                ('full', models.BooleanField(default=False)),
+                ('finished_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['scanned_through'], name='statsrefresh_scanned_idx')],
+            },
+        ),
+    ]
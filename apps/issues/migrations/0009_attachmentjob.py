@@ -0,0 +1,31 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0008_fileblob_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255)),
+                ('kind', models.CharField(choices=[('thumbnail', 'Thumbnail'), ('text', 'Extracted text')], max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('unsupported', 'Unsupported'), ('failed', 'Failed')], default='pending', max_length=12)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('error', models.TextField(blank=True)),
+                ('excerpt', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('source', 'kind'), name='attachmentjob_source_kind_uniq')],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='attachmentjob_status_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, models
+
+
+def rank(field, values):
+    return models.Case(
+        *[models.When(**{field: value}, then=models.Value(position)) for position, value in enumerate(values)],
+        output_field=models.PositiveSmallIntegerField(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0009_attachmentjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='status_rank',
+            field=models.GeneratedField(
+                expression=rank('status', ['pending', 'in_progress', 'resolved', 'rejected']),
+                output_field=models.PositiveSmallIntegerField(),
+                db_persist=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='priority_rank',
+            field=models.GeneratedField(
+                expression=rank('priority', ['low', 'medium', 'high', 'urgent']),
+                output_field=models.PositiveSmallIntegerField(),
+                db_persist=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['status_rank', 'id'], name='issue_status_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['priority_rank', 'id'], name='issue_priority_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0011_chunkedupload_attached_to'),
+    ]
+
+    # ?ordering=status/priority sorts on the rank columns since 0010, and the
+    # equality filters use (status, created_at) / (priority, created_at)
+    operations = [
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_status_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_priority_id_idx',
+        ),
+    ]
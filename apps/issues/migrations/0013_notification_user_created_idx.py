@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0012_drop_status_priority_id_indexes'),
+    ]
+
+    # A user's notification list, newest first, across read and unread;
+    # (user, is_read, created_at) only orders within one is_read value
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'created_at'], name='notification_user_created_idx'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.utils import timezone
 from django.db import models
@@ -46,6 +48,9 @@ class Enrollment(models.Model):
     
     class Meta:
         unique_together = ['student', 'course', 'semester', 'academic_year']
+        indexes = [
+            models.Index(fields=['course', 'academic_year', 'semester'], name='enrollment_course_term_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.username} - {self.course.course_code} ({self.semester}, {self.academic_year})"
@@ -63,6 +68,16 @@ class IssueCategory(models.Model):
     class Meta:
         verbose_name_plural = "Issue Categories"
 
+def choice_rank(field, choices):
+    """
+    Expression numbering ``field`` in the order its choices are declared
+    (low < medium < high < urgent) instead of alphabetically.
+    """
+    return models.Case(
+        *[models.When(**{field: value}, then=models.Value(rank)) for rank, (value, _) in enumerate(choices)],
+        output_field=models.PositiveSmallIntegerField(),
+    )
+
 class Issue(models.Model):
     """
     Model to track academic issues reported by students.
@@ -95,6 +110,17 @@ class Issue(models.Model):
     
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
+    # What ?ordering=status / ?ordering=priority sort by (see apps.issues.pagination)
+    status_rank = models.GeneratedField(
+        expression=choice_rank('status', STATUS_CHOICES),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+    priority_rank = models.GeneratedField(
+        expression=choice_rank('priority', PRIORITY_CHOICES),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
     
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, 
                                   related_name='assigned_issues')
@@ -105,9 +131,62 @@ class Issue(models.Model):
     
     attachments = models.FileField(upload_to='issue_attachments/', null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='issue_created_id_idx'),
+            models.Index(fields=['student', 'created_at'], name='issue_student_created_idx'),
+            models.Index(fields=['assigned_to', 'created_at'], name='issue_assignee_created_idx'),
+            models.Index(fields=['course', 'created_at'], name='issue_course_created_idx'),
+            models.Index(fields=['status', 'priority', 'created_at'], name='issue_status_priority_idx'),
+            # Structured list filters and ?ordering= (see apps.issues.filtering)
+            models.Index(fields=['status', 'created_at'], name='issue_status_created_idx'),
+            models.Index(fields=['priority', 'created_at'], name='issue_priority_created_idx'),
+            models.Index(fields=['category', 'created_at'], name='issue_category_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='issue_updated_id_idx'),
+            models.Index(fields=['status_rank', 'id'], name='issue_status_rank_idx'),
+            models.Index(fields=['priority_rank', 'id'], name='issue_priority_rank_idx'),
+        ]
+    
+    # Fields diffed by the track_issue_changes signal (course_id: stats rollup,
+    # attachments: attachment artefacts)
+    TRACKED_FIELDS = ('current_grade', 'priority', 'assigned_to_id', 'status', 'course_id', 'attachments')
+    
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.snapshot_tracked_fields()
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.snapshot_tracked_fields()
+    
+    def snapshot_tracked_fields(self):
+        """Remember the persisted values of the tracked fields that are loaded."""
+        self._loaded_values = {
+            # Files are remembered by name, as values() returns them
+            field: getattr(self.__dict__[field], 'name', self.__dict__[field])
+            for field in self.TRACKED_FIELDS if field in self.__dict__
+        }
+    
+    def get_loaded_values(self):
+        """
+        Persisted values of the tracked fields. Fields that were deferred (or
+        an instance built by hand with a pk) fall back to one narrow query.
+        """
+        loaded = dict(getattr(self, '_loaded_values', {}))
+        missing = [field for field in self.TRACKED_FIELDS if field not in loaded]
+        if missing and self.pk:
+            loaded.update(Issue.objects.filter(pk=self.pk).values(*missing).first() or {})
+        return loaded
+    
     def resolve(self):
         """Method to mark an issue as resolved"""
         self.status = 'resolved'
@@ -124,6 +203,12 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     attachment = models.FileField(upload_to='comment_attachments/', null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='comment_created_id_idx'),
+            models.Index(fields=['issue', 'created_at'], name='comment_issue_created_idx'),
+        ]
+    
     def __str__(self):
         return f"Comment by {self.user.username} on {self.issue.title}"
 
@@ -138,6 +223,12 @@ class AuditLog(models.Model):
     new_value = models.CharField(max_length=255, null=True, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='auditlog_timestamp_id_idx'),
+            models.Index(fields=['issue', 'timestamp'], name='auditlog_issue_timestamp_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.action} by {self.user.username} on {self.timestamp}"
 
@@ -152,5 +243,168 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='notification_created_id_idx'),
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notification_user_read_idx'),
+            models.Index(fields=['user', 'created_at'], name='notification_user_created_idx'),
+        ]
+    
     def __str__(self):
         return f"Notification for {self.user.username}: {self.title}"
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email written in the same transaction as the change that
+    triggered it and delivered by the ``send_outbox_mail`` command.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+class IssueStats(models.Model):
+    """
+    Issue counts per (course, assignee, status, priority), maintained by
+    apps.issues.analytics so reports don't aggregate the issue table.
+    """
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='+')
+    assigned_to = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=Issue.PRIORITY_CHOICES)
+    issue_count = models.PositiveIntegerField(default=0)
+    resolved_count = models.PositiveIntegerField(default=0)
+    # Sum of resolved_at - created_at over the resolved issues of the bucket
+    resolution_microseconds = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name_plural = "Issue stats"
+    
+    def __str__(self):
+        return f"{self.course_id}/{self.assigned_to_id}/{self.status}/{self.priority}: {self.issue_count}"
+
+class IssueStatsRefresh(models.Model):
+    """One run of the issue stats refresh; the latest one is the rescan watermark."""
+    scanned_through = models.DateTimeField()
+    courses = models.PositiveIntegerField(default=0)
+    full = models.BooleanField(default=False)
+    finished_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['scanned_through'], name='statsrefresh_scanned_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Stats refresh through {self.scanned_through} ({self.courses} courses)"
+
+class FileBlob(models.Model):
+    """
+    An uploaded file stored once under its SHA-256. Issues and comments
+    refer to it by pointing their file fields at ``file``.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    file = models.FileField(upload_to='blobs/', max_length=255, unique=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.sha256} ({self.size} bytes)"
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload in progress (see apps.issues.uploads). Chunks are
+    appended to a partial file; ``offset`` is where the next one starts.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    # Optional client-declared hash, checked once the last chunk arrives
+    expected_sha256 = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    blob = models.ForeignKey(FileBlob, on_delete=models.SET_NULL, null=True, blank=True, related_name='uploads')
+    # Where the finished file was attached; downloads take their filename from here
+    issue = models.ForeignKey(Issue, on_delete=models.SET_NULL, null=True, blank=True,
+                              related_name='attached_uploads')
+    comment = models.ForeignKey(Comment, on_delete=models.SET_NULL, null=True, blank=True,
+                                related_name='attached_uploads')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='upload_status_updated_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size}, {self.status})"
+
+class AttachmentJob(models.Model):
+    """
+    One derived artefact (thumbnail or extracted text) of an attachment,
+    produced by the ``process_attachments`` command. The (source, kind)
+    pair is unique, so queueing the same file again is a no-op.
+    """
+    KIND_CHOICES = [
+        ('thumbnail', 'Thumbnail'),
+        ('text', 'Extracted text'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('unsupported', 'Unsupported'),
+        ('failed', 'Failed'),
+    ]
+    
+    source = models.CharField(max_length=255)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    error = models.TextField(blank=True)
+    # Start of the extracted text, shown on the issue detail response
+    excerpt = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'kind'], name='attachmentjob_source_kind_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='attachmentjob_status_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} of {self.source} ({self.status})"
@@ -0,0 +1,148 @@
+import time
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .events import publish_on_commit
+from .models import Notification, User
+
+UNREAD_COUNT_KEY = 'notifications:unread:{}'
+UNREAD_MODIFIED_KEY = 'notifications:unread-modified:{}'
+# Bounds how long a counter that missed an update can drift
+UNREAD_COUNT_TIMEOUT = 600
+
+
+class NotificationBatch:
+    """
+    Collects the notifications raised by one issue action and writes them
+    with a single bulk INSERT instead of one query per recipient.
+    """
+
+    def __init__(self, issue=None):
+        self.issue = issue
+        self.notifications = []
+
+    def add(self, user, title, message):
+        """Queue a notification for ``user`` (an instance or a primary key)."""
+        user_id = getattr(user, 'pk', user)
+        if user_id is None:
+            return
+        self.notifications.append(Notification(
+            user_id=user_id,
+            issue=self.issue,
+            title=title,
+            message=message,
+        ))
+
+    def add_many(self, users, title, message):
+        for user in users:
+            self.add(user, title, message)
+
+    def send(self):
+        """Write the queued notifications and return them."""
+        if not self.notifications:
+            return []
+        notifications, self.notifications = self.notifications, []
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(notifications)
+            if created[0].pk is None:
+                fetch_ids(created)
+        for user_id, count in Counter(n.user_id for n in created).items():
+            adjust_unread_count(user_id, count)
+        for notification in created:
+            publish_on_commit([notification.user_id], 'notification', {
+                'id': notification.pk,
+                'title': notification.title,
+                'message': notification.message,
+                'issue': notification.issue_id,
+                'is_read': notification.is_read,
+                'created_at': notification.created_at,
+            })
+        return created
+
+
+def fetch_ids(notifications):
+    """
+    Fill in the primary keys of just-inserted notifications on backends
+    where bulk_create doesn't return them (MySQL), by re-selecting the rows
+    along the (user, is_read, created_at) index.
+    """
+    rows = (
+        Notification.objects
+        .filter(user_id__in={n.user_id for n in notifications}, is_read=False,
+                created_at__in={n.created_at for n in notifications})
+        .order_by('pk')
+        .values_list('pk', 'user_id', 'created_at', 'title', 'message')
+    )
+    ids = defaultdict(list)
+    for pk, *key in rows:
+        ids[tuple(key)].append(pk)
+    for notification in notifications:
+        matches = ids[(notification.user_id, notification.created_at, notification.title, notification.message)]
+        if matches:
+            notification.pk = matches.pop(0)
+
+
+def admin_ids():
+    """Primary keys of all admins, without loading full user rows."""
+    return User.objects.filter(user_type='admin').values_list('pk', flat=True)
+
+
+def notify(user, title, message, issue=None):
+    """Send a single notification through the batch path."""
+    batch = NotificationBatch(issue)
+    batch.add(user, title, message)
+    return batch.send()
+
+
+def get_unread_count(user_id):
+    """
+    Return ``(count, modified)`` for the user's unread notifications, where
+    ``modified`` is the epoch second of the last change. A cache miss falls
+    back to a COUNT on the (user, is_read, created_at) index.
+    """
+    count_key = UNREAD_COUNT_KEY.format(user_id)
+    modified_key = UNREAD_MODIFIED_KEY.format(user_id)
+    values = cache.get_many([count_key, modified_key])
+    count = values.get(count_key)
+    modified = values.get(modified_key)
+    if count is None or count < 0:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.set(count_key, count, UNREAD_COUNT_TIMEOUT)
+    if modified is None:
+        modified = int(time.time())
+        cache.set(modified_key, modified, UNREAD_COUNT_TIMEOUT)
+    return count, modified
+
+
+def _touch(user_id):
+    cache.set(UNREAD_MODIFIED_KEY.format(user_id), int(time.time()), UNREAD_COUNT_TIMEOUT)
+
+
+def adjust_unread_count(user_id, delta):
+    """Shift the cached counter by ``delta`` once the transaction commits."""
+    def apply():
+        try:
+            cache.incr(UNREAD_COUNT_KEY.format(user_id), delta)
+        except ValueError:
+            # Not cached; the next read recounts
+            pass
+        _touch(user_id)
+    transaction.on_commit(apply)
+
+
+def reset_unread_count(user_id, count=0):
+    """Set the cached counter to a known value once the transaction commits."""
+    def apply():
+        cache.set(UNREAD_COUNT_KEY.format(user_id), count, UNREAD_COUNT_TIMEOUT)
+        _touch(user_id)
+    transaction.on_commit(apply)
+
+
+def invalidate_unread_count(user_id):
+    """Drop the cached counter so the next read recounts from the database."""
+    def apply():
+        cache.delete(UNREAD_COUNT_KEY.format(user_id))
+        _touch(user_id)
+    transaction.on_commit(apply)
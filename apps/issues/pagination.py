@@ -0,0 +1,204 @@
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a composite, unique ordering such as
+    ``(created_at, id)``.
+
+    Each page is fetched with a ``WHERE (created_at, id) < (...)`` seek
+    instead of an ``OFFSET``, so deep pages cost the same as the first one
+    as long as an index matches ``ordering``. The total count is optional
+    because it is a full ``COUNT(*)`` of the filtered queryset.
+
+    Clients may sort by one of ``ordering_fields`` with ``?ordering=``
+    (``-`` for descending); ``id`` breaks ties in the same direction.
+    ``ordering_columns`` maps a name to the column actually sorted by.
+    """
+    ordering = ('-id',)
+    ordering_fields = ()
+    ordering_columns = {}
+    ordering_query_param = 'ordering'
+    page_size = api_settings.PAGE_SIZE or 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    include_count = True
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_request_ordering(request)
+        self.count = queryset.count() if self.get_include_count(request) else None
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['r'])
+        if cursor is not None:
+            queryset = queryset.filter(self.get_seek_filter(cursor['v'], reverse))
+
+        ordering = self.get_ordering(reverse)
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = self.get_position(results[-1])
+            if cursor is not None and (has_more or not reverse):
+                self.previous_position = self.get_position(results[0])
+        return results
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'example': 123},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_request_ordering(self, request):
+        value = request.query_params.get(self.ordering_query_param)
+        if not value:
+            return type(self).ordering
+        if value.lstrip('-') not in self.ordering_fields:
+            raise ValidationError({self.ordering_query_param: [
+                f"Ordering must be one of: {', '.join(self.ordering_fields)}, optionally prefixed with '-'"
+            ]})
+        return self.resolve_ordering(value)
+
+    @classmethod
+    def resolve_ordering(cls, value):
+        """``?ordering=`` value -> the composite ordering applied."""
+        direction = '-' if value.startswith('-') else ''
+        name = value.lstrip('-')
+        return (direction + cls.ordering_columns.get(name, name), direction + 'id')
+
+    def get_include_count(self, request):
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.include_count
+        return value.lower() not in ('0', 'false', 'no')
+
+    def get_fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def get_ordering(self, reverse):
+        if not reverse:
+            return self.ordering
+        return [field[1:] if field.startswith('-') else '-' + field for field in self.ordering]
+
+    def get_seek_filter(self, values, reverse):
+        """
+        Build the lexicographic "after this row" filter, i.e.
+        ``a < x OR (a = x AND b < y)`` for a descending ``(a, b)`` ordering.
+        """
+        descending = self.ordering[0].startswith('-')
+        lookup = 'lt' if descending != reverse else 'gt'
+        fields = self.get_fields()
+        clauses = []
+        for index, field in enumerate(fields):
+            equal = dict(zip(fields[:index], values[:index]))
+            clauses.append(Q(**equal, **{f'{field}__{lookup}': values[index]}))
+        return reduce(or_, clauses)
+
+    def get_position(self, instance):
+        position = []
+        for field in self.get_fields():
+            value = getattr(instance, field)
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return position
+
+    def encode_cursor(self, position, reverse):
+        data = json.dumps({'v': position, 'r': int(reverse), 'o': self.ordering[0]}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(data.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            values, reverse = cursor['v'], cursor['r']
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor only makes sense for the ordering it was issued under
+        if cursor.get('o', type(self).ordering[0]) != self.ordering[0]:
+            raise NotFound(self.invalid_cursor_message)
+        return {'v': values, 'r': bool(reverse)}
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+
+class IssueCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+    ordering_fields = ('created_at', 'updated_at', 'priority', 'status')
+    # Choice order rather than alphabetical (low < medium < high < urgent)
+    ordering_columns = {'priority': 'priority_rank', 'status': 'status_rank'}
+    max_page_size = 50
+
+
+class CommentCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+    max_page_size = 100
+
+
+class AuditLogCursorPagination(KeysetPagination):
+    ordering = ('-timestamp', '-id')
+    max_page_size = 200
+    include_count = False
+
+
+class NotificationCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+    max_page_size = 100
+    include_count = False
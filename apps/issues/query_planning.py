@@ -0,0 +1,120 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _relation_path(model, attrs):
+    """
+    Walk ``attrs`` across forward/one-to-one relations of ``model`` and return
+    the joinable part of the path (e.g. ``['course', 'lecturer']``).
+    """
+    path = []
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or not (field.many_to_one or field.one_to_one):
+            break
+        path.append(attr)
+        model = field.related_model
+    return path
+
+
+@lru_cache(maxsize=256)
+def build_plan(serializer_class, fields=None, reference_joins=False):
+    """
+    Work out which joins and prefetches a model serializer needs to render
+    without per-row queries.
+
+    Returns ``(select_related, prefetches)`` where ``prefetches`` is a tuple
+    of ``(lookup, child_serializer_class_or_None)``. ``fields`` restricts the
+    plan to a sparse fieldset; ``reference_joins`` plans reference fields by
+    their ``joined_source``. The result is cached per serializer class and
+    arguments because serializer declarations never change at runtime.
+    """
+    model = serializer_class.Meta.model
+    select_related = set(getattr(serializer_class.Meta, 'select_related_hints', ()))
+    prefetches = []
+
+    for name, field in serializer_class().fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if field.write_only or field.source == '*':
+            continue
+        source = field.source
+        if reference_joins and getattr(field, 'joined_source', None):
+            source = field.joined_source
+        attrs = source.split('.')
+
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+            child_class = type(child) if isinstance(child, serializers.ModelSerializer) else None
+            prefetches.append((field.source.replace('.', '__'), child_class))
+            continue
+
+        if isinstance(field, serializers.ModelSerializer):
+            # Nested single object: the whole path is traversed.
+            path = _relation_path(model, attrs)
+        else:
+            # ``student.get_full_name`` traverses ``student``; a bare
+            # ``student`` is rendered from ``student_id`` and needs no join.
+            path = _relation_path(model, attrs[:-1])
+        if path:
+            select_related.add('__'.join(path))
+
+    return tuple(sorted(select_related)), tuple(prefetches)
+
+
+def plan_queryset(queryset, serializer_class, fields=None):
+    """
+    Apply the select_related/prefetch_related plan of ``serializer_class``
+    (optionally restricted to ``fields``) to ``queryset``.
+    """
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return queryset
+
+    # Reference fields read their relations unless the cache behind them is shared
+    select_related, prefetches = build_plan(serializer_class, fields, not settings.SHARED_CACHE)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+
+    lookups = []
+    for lookup, child_class in prefetches:
+        if child_class is None:
+            lookups.append(lookup)
+            continue
+        child_model = child_class.Meta.model
+        lookups.append(Prefetch(
+            lookup,
+            queryset=plan_queryset(child_model._default_manager.all(), child_class),
+        ))
+    if lookups:
+        queryset = queryset.prefetch_related(*lookups)
+    return queryset
+
+
+class QueryPlanMixin:
+    """
+    ViewSet mixin that applies the query plan of the serializer used by the
+    current action to the queryset returned by ``get_base_queryset``.
+    Only ``planned_actions`` render rows from the queryset; other actions
+    (writes, custom actions) get the bare queryset, so they don't prefetch
+    relations they never read.
+    """
+    planned_actions = ('list', 'retrieve')
+
+    def get_base_queryset(self):
+        return super().get_queryset()
+
+    def get_queryset(self):
+        if self.action not in self.planned_actions:
+            return self.get_base_queryset()
+        serializer_class = self.get_serializer_class()
+        fields = None
+        if hasattr(serializer_class, 'get_requested_fields'):
+            fields = serializer_class.get_requested_fields(self.request)
+        return plan_queryset(self.get_base_queryset(), serializer_class, fields)
@@ -0,0 +1,110 @@
+import threading
+
+from django.conf import settings
+
+from apps.common.versions import get_versions
+
+from .models import Course, IssueCategory
+
+# Data sets whose writes change what is held here; bumped by signals
+VERSIONS = ('course', 'issuecategory', 'user')
+
+
+def load_courses(queryset):
+    rows = queryset.values('pk', 'course_code', 'course_name', 'lecturer_id',
+                           'lecturer__first_name', 'lecturer__last_name')
+    return {
+        row['pk']: {
+            'course_code': row['course_code'],
+            'course_name': row['course_name'],
+            # As User.get_full_name, which serializers read when the cache isn't shared
+            'lecturer_name': (
+                f"{row['lecturer__first_name']} {row['lecturer__last_name']}".strip()
+                if row['lecturer_id'] else None
+            ),
+        }
+        for row in rows.iterator(chunk_size=2000)
+    }
+
+
+def load_categories(queryset):
+    return {row['pk']: {'name': row['name']} for row in queryset.values('pk', 'name')}
+
+
+LOADERS = {
+    'course': (Course, load_courses),
+    'category': (IssueCategory, load_categories),
+}
+
+
+class Snapshot:
+    """One consistent, read-only copy of the reference tables."""
+
+    def __init__(self, version, tables):
+        self.version = version
+        self.tables = tables
+
+    def get(self, table, pk, attribute):
+        row = self.tables[table].get(pk)
+        if row is None:
+            # Created after this snapshot was taken (or not yet committed)
+            model, loader = LOADERS[table]
+            row = loader(model.objects.filter(pk=pk)).get(pk)
+            if row is None:
+                return None
+        return row[attribute]
+
+
+class ReferenceData:
+    """
+    Process-local copy of courses (with lecturer display names) and issue
+    categories, so serializers can print codes and names without joining
+    them into every list query.
+
+    The copy is reloaded whole when the shared versions of courses,
+    categories or users move on, which signals do on every write. The
+    check is one cache read, made once per request by ``snapshot_for``.
+    Without settings.SHARED_CACHE other workers' writes never reach the
+    versions seen here, so ReferenceField joins the relations instead and
+    ``current`` loads a fresh copy for any other caller.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def load(self, version=None):
+        return Snapshot(version, {
+            table: loader(model.objects.all()) for table, (model, loader) in LOADERS.items()
+        })
+
+    def current(self):
+        if not settings.SHARED_CACHE:
+            return self.load()
+        version = get_versions(*VERSIONS)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                # ``version`` was read before the load, so a change racing it triggers another reload
+                self._snapshot = self.load(version)
+            return self._snapshot
+
+    def clear(self):
+        with self._lock:
+            self._snapshot = None
+
+
+reference_data = ReferenceData()
+
+
+def snapshot_for(context):
+    """The snapshot for a serializer context, taken once per request."""
+    request = context.get('request')
+    if request is None:
+        return reference_data.current()
+    snapshot = getattr(request, '_reference_snapshot', None)
+    if snapshot is None:
+        snapshot = request._reference_snapshot = reference_data.current()
+    return snapshot
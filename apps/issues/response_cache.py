@@ -0,0 +1,114 @@
+import hashlib
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.common.caching import TTLCache
+from apps.common.versions import get_versions
+
+CACHE_KEY = 'response-cache:{}'
+OUTCOMES = ('local', 'shared', 'miss')
+
+
+class ResponseCacheMetrics:
+    """Per-process hit counts and time spent, by viewset and outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: dict.fromkeys(OUTCOMES, 0))
+        self._seconds = defaultdict(lambda: dict.fromkeys(OUTCOMES, 0.0))
+
+    def record(self, name, outcome, seconds):
+        with self._lock:
+            self._counts[name][outcome] += 1
+            self._seconds[name][outcome] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            report = {}
+            for name, counts in self._counts.items():
+                requests = sum(counts.values())
+                hits = counts['local'] + counts['shared']
+                report[name] = {
+                    'requests': requests,
+                    'hit_rate': round(hits / requests, 4) if requests else None,
+                    **{f'{outcome}_count': counts[outcome] for outcome in OUTCOMES},
+                    **{
+                        f'{outcome}_avg_ms': (
+                            round(self._seconds[name][outcome] / counts[outcome] * 1000, 3)
+                            if counts[outcome] else None
+                        )
+                        for outcome in OUTCOMES
+                    },
+                }
+            return report
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._seconds.clear()
+
+
+metrics = ResponseCacheMetrics()
+local_cache = TTLCache(settings.RESPONSE_CACHE_LOCAL_SIZE, settings.RESPONSE_CACHE_TTL)
+
+
+class CachedListMixin:
+    """
+    Caches ``list`` responses per (viewset, user scope, query parameters) in
+    a process-local LRU in front of Django's cache.
+
+    Keys embed the current version of every data set in
+    ``cache_dependencies`` (see apps.issues.versions). Writes bump those
+    versions through signals, so a changed table changes the key and stale
+    entries are simply never looked up again. Responses carry ``X-Cache:
+    local|shared|miss``.
+
+    Caching is off unless settings.SHARED_CACHE: with a per-process cache,
+    one worker's writes wouldn't retire the others' entries, and LocMem's
+    eviction could drop the version keys themselves.
+    """
+    cache_dependencies = ()  # Model names, e.g. ('course', 'user')
+
+    def get_cache_scope(self):
+        """Part of the key separating users who may see different rows."""
+        return 'all'
+
+    def get_response_cache_key(self, request):
+        params = sorted(request.query_params.lists())
+        parts = (type(self).__name__, self.action, self.get_cache_scope(),
+                 get_versions(*self.cache_dependencies), params)
+        return CACHE_KEY.format(hashlib.md5(repr(parts).encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        if not settings.SHARED_CACHE:
+            return super().list(request, *args, **kwargs)
+        start = time.perf_counter()
+        key = self.get_response_cache_key(request)
+        outcome = 'local'
+        data = local_cache.get(key)
+        if data is None:
+            outcome = 'shared'
+            data = cache.get(key)
+            if data is not None:
+                local_cache.set(key, data)
+
+        if data is None:
+            outcome = 'miss'
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(key, data, settings.RESPONSE_CACHE_TTL)
+            local_cache.set(key, data)
+        else:
+            response = Response(data)
+
+        metrics.record(type(self).__name__, outcome, time.perf_counter() - start)
+        response['X-Cache'] = outcome
+        return response
@@ -0,0 +1,128 @@
+import re
+from functools import reduce
+from operator import and_
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework import filters
+
+from .models import Comment, Issue
+
+# Word characters only: boolean-mode operators in user input are dropped
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+
+
+class Match(Func):
+    """
+    ``MATCH (columns) AGAINST (%s IN BOOLEAN MODE)`` over a MySQL FULLTEXT
+    index. Built as an expression so column references follow table
+    aliases inside subqueries.
+    """
+    template = 'MATCH (%(expressions)s) AGAINST (%%s IN BOOLEAN MODE)'
+    output_field = FloatField()
+
+    def __init__(self, *expressions, against, **extra):
+        super().__init__(*expressions, **extra)
+        self.against = against
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return sql, (*params, self.against)
+
+
+def parse_terms(query):
+    return TERM_RE.findall(query)[:MAX_TERMS]
+
+
+def split_terms(terms):
+    """``(text_terms, status_terms)``: terms naming an issue status, e.g. ``resolved``, go in the second."""
+    statuses = {value for value, _ in Issue.STATUS_CHOICES}
+    return (
+        [term for term in terms if term.lower() not in statuses],
+        [term.lower() for term in terms if term.lower() in statuses],
+    )
+
+
+def fulltext_enabled():
+    return connection.vendor == 'mysql'
+
+
+def _against(terms):
+    # Every term is required and prefix-matched: "+gra* +appe*"
+    return ' '.join(f'+{term}*' for term in terms)
+
+
+def _issue_match(against):
+    return Match(F('title'), F('description'), against=against)
+
+
+def _comment_match(against):
+    return Match(F('content'), against=against)
+
+
+def _text_filter(terms):
+    """Issues whose title, description or comments match every one of ``terms``."""
+    if fulltext_enabled():
+        against = _against(terms)
+        # Two semi-joins, each answered by its own FULLTEXT index
+        issue_ids = Issue.objects.alias(score=_issue_match(against)).filter(score__gt=0).values('pk')
+        comment_issue_ids = Comment.objects.alias(score=_comment_match(against)).filter(score__gt=0).values('issue_id')
+        return Q(pk__in=issue_ids) | Q(pk__in=comment_issue_ids)
+
+    # Portable fallback (e.g. SQLite in development): LIKE scans
+    clauses = []
+    for term in terms:
+        comment_issue_ids = Comment.objects.filter(content__icontains=term).values('issue_id')
+        clauses.append(Q(title__icontains=term) | Q(description__icontains=term) | Q(pk__in=comment_issue_ids))
+    return reduce(and_, clauses)
+
+
+def search_issues(queryset, query):
+    """
+    Restrict ``queryset`` to issues whose title, description or comments
+    match every term of ``query`` (prefix match). A term naming a status
+    is also satisfied by issues in that status, as ``?search=resolved``
+    was before full-text search. Role scoping is whatever ``queryset``
+    already carries.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset
+
+    text_terms, status_terms = split_terms(terms)
+    conditions = [_text_filter(text_terms)] if text_terms else []
+    for term in status_terms:
+        conditions.append(Q(status=term) | _text_filter([term]))
+    return queryset.filter(reduce(and_, conditions))
+
+
+def rank_issues(queryset, query):
+    """
+    Like ``search_issues`` but annotated with ``search_rank`` (issue
+    relevance plus its best-matching comment) and ordered by it.
+    """
+    queryset = search_issues(queryset, query)
+    terms = parse_terms(query)
+    if not terms or not fulltext_enabled():
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).order_by('-created_at')
+
+    # Rank on the text; a status term may have matched the status column alone
+    against = _against(split_terms(terms)[0] or terms)
+    best_comment = (
+        Comment.objects.filter(issue=OuterRef('pk'))
+        .annotate(score=_comment_match(against))
+        .order_by('-score')
+        .values('score')[:1]
+    )
+    return queryset.annotate(
+        search_rank=_issue_match(against) + Coalesce(Subquery(best_comment, output_field=FloatField()), 0.0)
+    ).order_by('-search_rank', '-created_at')
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """``?search=`` over issue text and comments through ``search_issues``."""
+
+    def filter_queryset(self, request, queryset, view):
+        return search_issues(queryset, request.query_params.get(self.search_param, ''))
@@ -1,5 +1,65 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
-from .models import User, Course, Enrollment, IssueCategory, Issue, Comment, AuditLog, Notification
+from .models import (
+    User, Course, Enrollment, IssueCategory, Issue, Comment, AuditLog, Notification, ChunkedUpload,
+    AttachmentJob
+)
+from .artifacts import KINDS as ARTIFACT_KINDS
+from .reference_data import snapshot_for
+
+class SparseFieldsetMixin:
+    """
+    Lets GET clients ask for a subset of fields with ``?fields=id,title``.
+    """
+    @classmethod
+    def get_requested_fields(cls, request):
+        if request is None or request.method != 'GET':
+            return None
+        fields = request.query_params.get('fields')
+        if not fields:
+            return None
+        return frozenset(name.strip() for name in fields.split(',') if name.strip())
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.get_requested_fields(self.context.get('request'))
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+class ReferenceField(serializers.ReadOnlyField):
+    """
+    A course or category attribute read from the reference data cache by
+    id, e.g. ``ReferenceField('course', 'course_code', 'course.course_code',
+    source='course_id')``. Reading only the id keeps the relation out of the
+    query plan.
+
+    Without settings.SHARED_CACHE the cache can't be kept current, so the
+    field reads ``joined_source`` instead and the query planner joins its
+    relations like any other dotted source.
+    """
+    
+    def __init__(self, table, attribute, joined_source, **kwargs):
+        self.table = table
+        self.attribute = attribute
+        self.joined_source = joined_source
+        super().__init__(**kwargs)
+    
+    def get_attribute(self, instance):
+        if settings.SHARED_CACHE:
+            return super().get_attribute(instance)
+        value = instance
+        for attr in self.joined_source.split('.'):
+            if value is None:
+                return None
+            value = getattr(value, attr)
+        return value() if callable(value) else value
+    
+    def to_representation(self, value):
+        if not settings.SHARED_CACHE:
+            return value
+        return snapshot_for(self.context).get(self.table, value, self.attribute)
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -16,20 +76,15 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 class CourseSerializer(serializers.ModelSerializer):
-    lecturer_name = serializers.SerializerMethodField()
+    lecturer_name = ReferenceField('course', 'lecturer_name', 'lecturer.get_full_name', source='pk')
     
     class Meta:
         model = Course
         fields = ['id', 'course_code', 'course_name', 'description', 'lecturer', 'lecturer_name']
-    
-    def get_lecturer_name(self, obj):
-        if obj.lecturer:
-            return f"{obj.lecturer.first_name} {obj.lecturer.last_name}"
-        return None
 
 class EnrollmentSerializer(serializers.ModelSerializer):
-    course_code = serializers.CharField(source='course.course_code', read_only=True)
-    course_name = serializers.CharField(source='course.course_name', read_only=True)
+    course_code = ReferenceField('course', 'course_code', 'course.course_code', source='course_id')
+    course_name = ReferenceField('course', 'course_name', 'course.course_name', source='course_id')
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     
     class Meta:
@@ -50,20 +105,62 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ['id', 'issue', 'user', 'user_name', 'user_type', 'content', 'created_at', 'attachment']
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
-    course_code = serializers.CharField(source='course.course_code', read_only=True)
-    course_name = serializers.CharField(source='course.course_name', read_only=True)
-    category_name = serializers.CharField(source='category.name', read_only=True)
+    course_code = ReferenceField('course', 'course_code', 'course.course_code', source='course_id')
+    course_name = ReferenceField('course', 'course_name', 'course.course_name', source='course_id')
+    category_name = ReferenceField('category', 'name', 'category.name', source='category_id')
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
     comments = CommentSerializer(many=True, read_only=True)
+    attachment_previews = serializers.SerializerMethodField()
     
     class Meta:
         model = Issue
         fields = ['id', 'title', 'description', 'category', 'category_name', 'student', 'student_name', 
                  'course', 'course_code', 'course_name', 'enrollment', 'current_grade', 'expected_grade',
                  'status', 'priority', 'assigned_to', 'assigned_to_name', 'created_at', 'updated_at', 
-                 'resolved_at', 'attachments', 'comments']
+                 'resolved_at', 'attachments', 'attachment_previews', 'comments']
+    
+    def get_attachment_previews(self, obj):
+        """
+        Thumbnail link and text excerpt produced by process_attachments, so
+        the attachment doesn't have to be downloaded to triage the issue.
+        """
+        if not obj.attachments:
+            return None
+        jobs = {job.kind: job for job in AttachmentJob.objects.filter(source=obj.attachments.name)}
+        url = reverse('issue-attachment', kwargs={'pk': obj.pk})
+        previews = {}
+        for kind in ARTIFACT_KINDS:
+            job = jobs.get(kind)
+            previews[kind] = {
+                'status': job.status if job else 'pending',
+                'url': f'{url}?variant={kind}' if job and job.status == 'done' else None,
+            }
+        previews['text']['excerpt'] = jobs['text'].excerpt if 'text' in jobs else ''
+        return previews
+
+class IssueListSerializer(IssueSerializer):
+    """
+    List representation of an issue: the comment thread is replaced by
+    summary values annotated onto the queryset by IssueViewSet.
+    """
+    comments = None
+    attachment_previews = None
+    comment_count = serializers.IntegerField(read_only=True)
+    last_comment_at = serializers.DateTimeField(read_only=True, allow_null=True)
+    has_unread = serializers.BooleanField(read_only=True)
+    
+    class Meta(IssueSerializer.Meta):
+        fields = [field for field in IssueSerializer.Meta.fields
+                  if field not in ('comments', 'attachment_previews')] + [
+            'comment_count', 'last_comment_at', 'has_unread']
+
+class IssueSearchResultSerializer(IssueListSerializer):
+    search_rank = serializers.FloatField(read_only=True)
+    
+    class Meta(IssueListSerializer.Meta):
+        fields = IssueListSerializer.Meta.fields + ['search_rank']
 
 class AuditLogSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
@@ -78,4 +175,13 @@ class NotificationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Notification
-        fields = ['id', 'user', 'title', 'message', 'issue', 'issue_title', 'is_read', 'created_at']
\ No newline at end of file
+        fields = ['id', 'user', 'title', 'message', 'issue', 'issue_title', 'is_read', 'created_at']
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    sha256 = serializers.CharField(source='blob.sha256', read_only=True, allow_null=True)
+    
+    class Meta:
+        model = ChunkedUpload
+        fields = ['id', 'filename', 'content_type', 'size', 'offset', 'expected_sha256', 'status',
+                  'blob', 'sha256', 'created_at', 'updated_at']
+        read_only_fields = ['offset', 'status', 'blob', 'created_at', 'updated_at']
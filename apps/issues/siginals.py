@@ -1,8 +1,14 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
-from .models import Issue, Comment, Notification, AuditLog
+from apps.common.versions import bump_version
+from .models import User, Course, Enrollment, IssueCategory, Issue, Comment, Notification, AuditLog
+from .mail import queue_mail
+from .events import publish_on_commit
+from .directory import user_saved, user_deleted
+from .etags import bump_list_version
+from .analytics import refresh_courses_on_commit
+from .artifacts import enqueue as enqueue_artifacts
 
 @receiver(post_save, sender=Issue)
 def issue_created_notification(sender, instance, created, **kwargs):
@@ -16,82 +22,182 @@ def issue_created_notification(sender, instance, created, **kwargs):
 @receiver(post_save, sender=Comment)
 def comment_created_notification(sender, instance, created, **kwargs):
     """
-    Signal to send email notifications when a comment is created
+    Signal to queue email notifications when a comment is created
     """
     if created and settings.EMAIL_HOST:
         issue = instance.issue
         # Send email to student if comment is from lecturer or admin
-        if instance.user != issue.student:
-            try:
-                send_mail(
-                    subject=f"New Comment on Issue: {issue.title}",
-                    message=f"A new comment has been added to your issue '{issue.title}' by {instance.user.get_full_name()}.\n\nComment: {instance.content}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[issue.student.email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                print(f"Email sending failed: {e}")
+        if instance.user_id != issue.student_id:
+            queue_mail(
+                subject=f"New Comment on Issue: {issue.title}",
+                message=f"A new comment has been added to your issue '{issue.title}' by {instance.user.get_full_name()}.\n\nComment: {instance.content}",
+                recipient_list=[issue.student.email],
+            )
         
         # Send email to lecturer if comment is from student or admin
-        if issue.course.lecturer and instance.user != issue.course.lecturer:
-            try:
-                send_mail(
-                    subject=f"New Comment on Issue: {issue.title}",
-                    message=f"A new comment has been added to an issue '{issue.title}' for your course {issue.course.course_code} by {instance.user.get_full_name()}.\n\nComment: {instance.content}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[issue.course.lecturer.email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                print(f"Email sending failed: {e}")
+        if issue.course.lecturer_id and instance.user_id != issue.course.lecturer_id:
+            queue_mail(
+                subject=f"New Comment on Issue: {issue.title}",
+                message=f"A new comment has been added to an issue '{issue.title}' for your course {issue.course.course_code} by {instance.user.get_full_name()}.\n\nComment: {instance.content}",
+                recipient_list=[issue.course.lecturer.email],
+            )
+
+def _course_lecturer_id(instance):
+    """The issue's course lecturer id, using the cached course when loaded."""
+    if Issue._meta.get_field('course').is_cached(instance):
+        return instance.course.lecturer_id
+    return Course.objects.filter(pk=instance.course_id).values_list('lecturer_id', flat=True).first()
+
+def _audit_user_id(instance):
+    """Who the auto-tracked rows are attributed to, without loading users."""
+    return instance.assigned_to_id or _course_lecturer_id(instance)
+
+def _user_labels(*user_ids):
+    """``str(user)`` for the given ids in one query."""
+    users = User.objects.in_bulk([user_id for user_id in user_ids if user_id])
+    return {user_id: str(user) for user_id, user in users.items()}
 
 @receiver(pre_save, sender=Issue)
 def track_issue_changes(sender, instance, **kwargs):
     """
-    Signal to track changes to issues
+    Signal to track changes to issues.
+    
+    Diffs against the values snapshotted when the instance was loaded
+    (see Issue.snapshot_tracked_fields) instead of re-reading the row, and
+    writes all audit rows for this save in one bulk INSERT. Fields a view
+    has already logged, with the acting user, are listed in
+    ``instance._audited_fields`` and skipped here.
+    """
+    audited = instance.__dict__.pop('_audited_fields', frozenset())
+    if not instance.pk:  # New instance, nothing to compare against
+        return
+    
+    old = instance.get_loaded_values()
+    if len(old) != len(Issue.TRACKED_FIELDS):
+        # Row doesn't exist yet (explicit pk on create)
+        return
+    
+    # Push status changes to connected clients of everyone involved
+    if old['status'] != instance.status:
+        publish_on_commit(
+            [instance.student_id, instance.assigned_to_id, _course_lecturer_id(instance)],
+            'issue_status',
+            {'issue': instance.pk, 'title': instance.title,
+             'old_status': old['status'], 'status': instance.status},
+        )
+    
+    logs = []
+    
+    # Check for grade change
+    # This serves as a backup in case grade is changed outside the API
+    if (old['current_grade'] != instance.current_grade and instance.current_grade is not None
+            and 'current_grade' not in audited):
+        logs.append(AuditLog(
+            action="Grade updated (auto-tracked)",
+            old_value=str(old['current_grade']) if old['current_grade'] else "None",
+            new_value=str(instance.current_grade)
+        ))
+    
+    # Check for priority change
+    if old['priority'] != instance.priority and 'priority' not in audited:
+        priorities = dict(Issue.PRIORITY_CHOICES)
+        logs.append(AuditLog(
+            action="Priority changed (auto-tracked)",
+            old_value=priorities.get(old['priority'], old['priority']),
+            new_value=instance.get_priority_display()
+        ))
+    
+    # Check for assigned_to change
+    if old['assigned_to_id'] != instance.assigned_to_id and 'assigned_to_id' not in audited:
+        labels = _user_labels(old['assigned_to_id'], instance.assigned_to_id)
+        logs.append(AuditLog(
+            action="Assignment changed (auto-tracked)",
+            old_value=labels.get(old['assigned_to_id'], "None"),
+            new_value=labels.get(instance.assigned_to_id, "None")
+        ))
+    
+    if not logs:
+        return
+    
+    user_id = _audit_user_id(instance)
+    if user_id is None:
+        # Unassigned issue on a course without a lecturer: nobody to attribute to
+        return
+    for log in logs:
+        log.issue = instance
+        log.user_id = user_id
+    AuditLog.objects.bulk_create(logs)
+
+@receiver(post_save, sender=User)
+def update_user_directory(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the typeahead index in step with user saves; a last_login bump
+    doesn't change anything it shows.
     """
-    if instance.pk:  # If this is an update, not a new instance
-        try:
-            old_instance = Issue.objects.get(pk=instance.pk)
-            
-            # Check for status change
-            if old_instance.status != instance.status:
-                # Audit log is created in the view
-                pass
-                
-            # Check for grade change
-            if old_instance.current_grade != instance.current_grade and instance.current_grade is not None:
-                # Create audit log if not already created in the view
-                # This serves as a backup in case grade is changed outside the API
-                AuditLog.objects.create(
-                    issue=instance,
-                    user=instance.assigned_to if instance.assigned_to else instance.course.lecturer,
-                    action="Grade updated (auto-tracked)",
-                    old_value=str(old_instance.current_grade) if old_instance.current_grade else "None",
-                    new_value=str(instance.current_grade)
-                )
-                
-            # Check for priority change
-            if old_instance.priority != instance.priority:
-                AuditLog.objects.create(
-                    issue=instance,
-                    user=instance.assigned_to if instance.assigned_to else instance.course.lecturer,
-                    action="Priority changed (auto-tracked)",
-                    old_value=old_instance.get_priority_display(),
-                    new_value=instance.get_priority_display()
-                )
-                
-            # Check for assigned_to change
-            if old_instance.assigned_to != instance.assigned_to:
-                AuditLog.objects.create(
-                    issue=instance,
-                    user=instance.assigned_to if instance.assigned_to else instance.course.lecturer,
-                    action="Assignment changed (auto-tracked)",
-                    old_value=str(old_instance.assigned_to) if old_instance.assigned_to else "None",
-                    new_value=str(instance.assigned_to) if instance.assigned_to else "None"
-                )
-                
-        except Issue.DoesNotExist:
-            # This is a new instance, so no need to check for changes
-            pass
\ No newline at end of file
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    user_saved(instance)
+
+@receiver(post_delete, sender=User)
+def remove_from_user_directory(sender, instance, **kwargs):
+    user_deleted(instance.pk)
+
+@receiver([post_save, post_delete], sender=Issue)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=IssueCategory)
+@receiver([post_save, post_delete], sender=User)
+def invalidate_issue_list_etags(sender, update_fields=None, **kwargs):
+    """Anything shown on (or deciding visibility of) the issue list changed."""
+    if sender is User and update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_list_version()
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=IssueCategory)
+@receiver([post_save, post_delete], sender=Enrollment)
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_responses(sender, update_fields=None, **kwargs):
+    """Move the data set to a new version, retiring cached list responses built on it."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_version(sender._meta.model_name)
+
+@receiver(pre_save, sender=Issue)
+def refresh_stats_for_moved_issue(sender, instance, **kwargs):
+    """
+    The periodic stats refresh only sees the course an issue is in now, so
+    the course it left is recomputed here.
+    """
+    if not instance.pk:
+        return
+    old_course_id = instance.get_loaded_values().get('course_id')
+    if old_course_id is not None and old_course_id != instance.course_id:
+        refresh_courses_on_commit([old_course_id])
+
+@receiver(post_delete, sender=Issue)
+def refresh_stats_for_deleted_issue(sender, instance, **kwargs):
+    refresh_courses_on_commit([instance.course_id])
+
+@receiver(pre_delete, sender=User)
+def refresh_stats_for_deleted_assignee(sender, instance, **kwargs):
+    """Their issues are unassigned with an UPDATE that bumps no updated_at."""
+    refresh_courses_on_commit(
+        Issue.objects.filter(assigned_to=instance).values_list('course_id', flat=True).distinct()
+    )
+
+@receiver(post_save, sender=Issue)
+def queue_issue_attachment_artifacts(sender, instance, update_fields=None, **kwargs):
+    """Only when the attachment changed, not on every status or grade save."""
+    if update_fields is not None and 'attachments' not in update_fields:
+        return
+    name = instance.attachments.name
+    # post_save runs before Issue.save re-snapshots, so this is the old name
+    loaded = getattr(instance, '_loaded_values', {})
+    if 'attachments' not in loaded or (loaded['attachments'] or '') != (name or ''):
+        enqueue_artifacts(name)
+
+@receiver(post_save, sender=Comment)
+def queue_comment_attachment_artifacts(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'attachment' in update_fields:
+        enqueue_artifacts(instance.attachment.name)
@@ -0,0 +1,530 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import analytics
+from . import uploads
+from .directory import directory
+from .exports import iter_chunks
+from .mail import claim_batch, deliver_batch, queue_mail
+from .models import (
+    AuditLog, ChunkedUpload, Comment, Course, EmailOutbox, Enrollment, FileBlob, Issue, IssueCategory, IssueStats,
+    Notification, User,
+)
+from .pagination import AuditLogCursorPagination, CommentCursorPagination, NotificationCursorPagination
+from .reference_data import reference_data
+
+
+def make_user(username, user_type, **extra):
+    return User.objects.create(username=username, user_type=user_type, email=f'{username}@example.org', **extra)
+
+
+def leading_indexes(model, *columns):
+    """Names of the indexes on ``model`` whose leading columns are ``columns``."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    return {
+        name for name, info in constraints.items()
+        if (info['index'] or info['unique']) and info['columns'][:len(columns)] == list(columns)
+    }
+
+
+class IssueFixtureMixin:
+    """A lecturer's course with a few issues, each carrying a short comment thread."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin', 'admin')
+        cls.lecturer = make_user('lecturer', 'lecturer', first_name='Lee', last_name='Turner')
+        cls.student = make_user('student', 'student', first_name='Stu', last_name='Dent')
+        cls.course = Course.objects.create(course_code='CS101', course_name='Intro', lecturer=cls.lecturer)
+        cls.category = IssueCategory.objects.create(name='Marks')
+        cls.issues = []
+        for number in range(3):
+            issue = Issue.objects.create(
+                title=f'Issue {number}', description='Missing mark', category=cls.category,
+                student=cls.student, course=cls.course,
+            )
+            for author in (cls.student, cls.lecturer, cls.student):
+                Comment.objects.create(issue=issue, user=author, content='Following up')
+            cls.issues.append(issue)
+
+
+# Query counts must not depend on cache configuration
+@override_settings(SHARED_CACHE=False)
+class IssueQueryCountTests(IssueFixtureMixin, TestCase):
+    """The issue endpoints run a fixed number of queries, however many rows they return."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_list(self):
+        # COUNT, then the page with its comment/unread annotations and joined names
+        with self.assertNumQueries(2):
+            response = self.client.get('/issues/api/issues/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_detail(self):
+        # The issue with its joined names, then its comments with their authors
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/issues/api/issues/{self.issues[0].pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['comments']), 3)
+
+    def test_courses(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/issues/api/courses/')
+        self.assertEqual(response.data['results'][0]['lecturer_name'], 'Lee Turner')
+
+    def test_reference_data_renders_the_joined_names(self):
+        joined = self.client.get(f'/issues/api/issues/{self.issues[0].pk}/').data
+        reference_data.clear()
+        with self.settings(SHARED_CACHE=True):
+            for _ in range(2):
+                # The first request loads the reference data, the second reuses it
+                cached = self.client.get(f'/issues/api/issues/{self.issues[0].pk}/').data
+                self.assertEqual(cached, joined)
+        self.assertEqual(cached['course_code'], 'CS101')
+        self.assertEqual(cached['category_name'], 'Marks')
+
+    def test_assign_skips_the_comment_thread(self):
+        # Issue, assignee, UPDATE, audit row, notification (in a savepoint)
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                f'/issues/api/issues/{self.issues[0].pk}/assign/', {'assigned_to': self.lecturer.pk},
+            )
+        self.assertEqual(response.status_code, 200)
+
+
+class LoadEnrollmentsCommandTests(IssueFixtureMixin, TestCase):
+    def load(self, content):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'w') as stream:
+            stream.write(content)
+        stdout, stderr = StringIO(), StringIO()
+        call_command('load_enrollments', path, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_row_errors_are_reported_by_line(self):
+        _, stderr = self.load(
+            "student,course,semester,academic_year,current_grade\n"
+            "student,CS101,1,2024/2025,71\n"
+            "nobody,CS101,1,2024/2025,60\n"
+        )
+        self.assertEqual(stderr, "row 2: Unknown student: nobody\n")
+        self.assertEqual(Enrollment.objects.get(student=self.student).current_grade, 71)
+
+    def test_rejected_chunk_is_reported_by_line_range(self):
+        with mock.patch.object(Enrollment.objects, 'bulk_create', side_effect=IntegrityError('rejected')):
+            stdout, stderr = self.load(
+                "student,course,semester,academic_year\n"
+                "student,CS101,1,2024/2025\n"
+                "student,CS101,2,2024/2025\n"
+            )
+        self.assertEqual(stderr, "row 1-2: Chunk not loaded: rejected\n")
+        self.assertIn("2 rows, 0 upserted, 2 failed", stdout)
+
+
+class TypeaheadTests(IssueFixtureMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def lookup(self, query, **params):
+        response = self.client.get('/issues/api/users/typeahead/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [record['username'] for record in response.data]
+
+    def test_database_and_directory_agree(self):
+        cases = {
+            ('tur',): ['lecturer'],
+            ('LEE T',): ['lecturer'],
+            ('stu',): ['student'],
+            ('s', 'student'): ['student'],
+            ('nobody',): [],
+        }
+        for shared in (False, True):
+            directory.invalidate()
+            with self.settings(SHARED_CACHE=shared):
+                for (query, *user_type), expected in cases.items():
+                    params = {'user_type': user_type[0]} if user_type else {}
+                    with self.subTest(shared=shared, query=query):
+                        self.assertEqual(self.lookup(query, **params), expected)
+
+    def test_without_a_shared_cache_new_users_show_up_at_once(self):
+        self.lookup('new')
+        make_user('newcomer', 'student')
+        self.assertEqual(self.lookup('new'), ['newcomer'])
+
+
+class IndexPlanTests(IssueFixtureMixin, TestCase):
+    """EXPLAIN the hot list queries of the comment, audit log, notification and enrollment views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for issue in cls.issues:
+            AuditLog.objects.create(issue=issue, user=cls.admin, action='Status changed')
+            for user in (cls.student, cls.lecturer):
+                Notification.objects.create(user=user, issue=issue, title='Update', message='Changed')
+        Enrollment.objects.create(student=cls.student, course=cls.course, semester='1', academic_year='2024/2025')
+
+    def assertUsesIndex(self, queryset, *columns):
+        names = leading_indexes(queryset.model, *columns)
+        self.assertTrue(names, f"no index on {queryset.model._meta.db_table} starts with {columns}")
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in names), f"none of {sorted(names)} used:\n{plan}")
+
+    def test_comments(self):
+        ordering = CommentCursorPagination.ordering
+        self.assertUsesIndex(
+            Comment.objects.filter(issue_id=self.issues[0].pk).order_by(*ordering)[:21], 'issue_id', 'created_at',
+        )
+        self.assertUsesIndex(Comment.objects.order_by(*ordering)[:21], 'created_at', 'id')
+
+    def test_audit_logs(self):
+        ordering = AuditLogCursorPagination.ordering
+        self.assertUsesIndex(
+            AuditLog.objects.filter(issue_id=self.issues[0].pk).order_by(*ordering)[:21], 'issue_id', 'timestamp',
+        )
+        self.assertUsesIndex(AuditLog.objects.order_by(*ordering)[:21], 'timestamp', 'id')
+
+    def test_notifications(self):
+        ordering = NotificationCursorPagination.ordering
+        self.assertUsesIndex(
+            Notification.objects.filter(user=self.student).order_by(*ordering)[:21], 'user_id', 'created_at',
+        )
+        self.assertUsesIndex(Notification.objects.filter(user=self.student, is_read=False), 'user_id')
+
+    def test_enrollments(self):
+        self.assertUsesIndex(Enrollment.objects.filter(student=self.student), 'student_id')
+        self.assertUsesIndex(Enrollment.objects.filter(course__lecturer=self.lecturer), 'course_id')
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', EMAIL_HOST='smtp.example.org',
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60,
+)
+class OutboxTests(IssueFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Queued by the fixture's comments
+        cls.comment_mail = sorted(EmailOutbox.objects.values_list('recipients', flat=True))
+        EmailOutbox.objects.all().delete()
+
+    def test_comments_queue_mail_for_the_other_party(self):
+        self.assertEqual(self.comment_mail, [['lecturer@example.org']] * 6 + [['student@example.org']] * 3)
+        self.assertEqual(mail.outbox, [])
+
+    def test_queued_mail_rolls_back_with_the_request(self):
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                queue_mail('Subject', 'Body', ['student@example.org'])
+                raise IntegrityError
+        self.assertFalse(EmailOutbox.objects.exists())
+        self.assertIsNone(queue_mail('Subject', 'Body', ['', None]))
+
+    def test_status_change_queues_instead_of_sending(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post(f'/issues/api/issues/{self.issues[0].pk}/change_status/', {'status': 'resolved'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        queued = EmailOutbox.objects.get()
+        self.assertEqual(queued.recipients, ['student@example.org'])
+
+        self.assertEqual(deliver_batch(claim_batch(10)), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['student@example.org'])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('sent', 1))
+        self.assertEqual(claim_batch(10), [])
+
+    def test_claimed_rows_are_leased(self):
+        queue_mail('Subject', 'Body', ['student@example.org'])
+        self.assertEqual(len(claim_batch(10)), 1)
+        # Hidden from other workers until the lease runs out
+        self.assertEqual(claim_batch(10), [])
+
+    def test_failures_back_off_then_dead_letter(self):
+        queued = queue_mail('Subject', 'Body', ['student@example.org'])
+        with mock.patch('apps.issues.mail.EmailMessage.send', side_effect=OSError('refused')):
+            before = timezone.now()
+            self.assertEqual(deliver_batch([queued]), (0, 1))
+            queued.refresh_from_db()
+            self.assertEqual((queued.status, queued.attempts, queued.last_error), ('pending', 1, 'refused'))
+            self.assertGreaterEqual(queued.next_attempt_at, before + timedelta(seconds=60))
+
+            self.assertEqual(deliver_batch([queued]), (0, 1))
+            queued.refresh_from_db()
+            self.assertEqual((queued.status, queued.attempts), ('dead', 2))
+        self.assertEqual(mail.outbox, [])
+
+
+class AnalyticsTests(IssueFixtureMixin, TestCase):
+    """The rollup must always agree with the same aggregate run on the issue table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_course = Course.objects.create(course_code='CS102', course_name='Data', lecturer=cls.admin)
+        now = timezone.now()
+        cls.issues[0].assigned_to = cls.lecturer
+        cls.issues[0].save()
+        cls.issues[1].status, cls.issues[1].resolved_at = 'resolved', now + timedelta(hours=5)
+        cls.issues[1].save()
+        for priority in ('low', 'high'):
+            Issue.objects.create(
+                title=f'{priority} issue', description='Wrong grade', category=cls.category, student=cls.student,
+                course=cls.other_course, priority=priority, assigned_to=cls.admin,
+            )
+        # Old enough to fall outside refresh_changed's rescan overlap
+        Issue.objects.update(updated_at=now - timedelta(days=1))
+
+    def assertRollupCurrent(self):
+        summary = analytics.rollup_summary()
+        self.assertIsNotNone(summary.pop('refreshed_at'))
+        self.assertEqual(summary, analytics.reference_summary())
+
+    def test_rebuild(self):
+        analytics.rebuild()
+        self.assertRollupCurrent()
+        summary = analytics.rollup_summary()
+        self.assertEqual(summary['total'], 5)
+        self.assertEqual(summary['by_status']['resolved'], 1)
+        self.assertEqual(summary['mean_resolution_seconds'], 5 * 3600)
+        self.assertEqual(summary['open_backlog'][0], {'assigned_to': self.admin.pk, 'name': '', 'open': 2})
+
+    def test_refresh_rescans_only_changed_courses(self):
+        analytics.rebuild()
+        issue = Issue.objects.get(pk=self.issues[2].pk)
+        issue.status = 'in_progress'
+        issue.save()
+        self.assertEqual(analytics.refresh_changed().courses, 1)
+        self.assertRollupCurrent()
+        # Still inside RESCAN_OVERLAP of the previous run
+        self.assertEqual(analytics.refresh_changed().courses, 1)
+
+    def test_moved_and_deleted_issues_refresh_on_commit(self):
+        analytics.rebuild()
+        issue = Issue.objects.get(pk=self.issues[0].pk)
+        issue.course = self.other_course
+        with self.captureOnCommitCallbacks(execute=True):
+            issue.save()
+        # The course the issue left; the one it joined waits for refresh_changed
+        self.assertFalse(IssueStats.objects.filter(course=self.course, assigned_to=self.lecturer).exists())
+        analytics.refresh_changed()
+        self.assertRollupCurrent()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Issue.objects.filter(course=self.other_course).first().delete()
+        self.assertRollupCurrent()
+
+    def test_summary_queries_follow_buckets_not_issues(self):
+        analytics.rebuild()
+        with self.assertNumQueries(4):
+            analytics.rollup_summary()
+        Issue.objects.bulk_create(
+            Issue(title='Bulk', description='More', category=self.category, student=self.student, course=self.course)
+            for _ in range(50)
+        )
+        analytics.rebuild()
+        with self.assertNumQueries(4):
+            self.assertEqual(analytics.rollup_summary()['total'], 55)
+
+    def test_endpoint_is_admin_only(self):
+        analytics.rebuild()
+        client = APIClient()
+        client.force_authenticate(self.student)
+        self.assertEqual(client.get('/issues/api/analytics/').status_code, 403)
+        client.force_authenticate(self.admin)
+        response = client.get('/issues/api/analytics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 5)
+
+
+class ExportTests(IssueFixtureMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_chunks_seek_past_ties_on_the_date(self):
+        # All nine comments share one timestamp, so only the id orders them
+        Comment.objects.update(created_at=timezone.now())
+        columns = ['id', 'created_at']
+        # Four full chunks, then the short one that ends the export
+        with self.assertNumQueries(5):
+            chunks = list(iter_chunks(Comment.objects.all(), columns, 'created_at', chunk_size=2))
+        self.assertEqual([len(rows) for rows in chunks], [2, 2, 2, 2, 1])
+        ids = [row[0] for rows in chunks for row in rows]
+        self.assertEqual(ids, sorted(Comment.objects.values_list('pk', flat=True)))
+
+    def test_exact_multiple_of_the_chunk_size(self):
+        chunks = list(iter_chunks(Comment.objects.all(), ['id', 'created_at'], 'created_at', chunk_size=3))
+        self.assertEqual([len(rows) for rows in chunks], [3, 3, 3])
+
+    def test_csv(self):
+        lines = self.read(self.client.get('/issues/api/comments/export/')).splitlines()
+        self.assertEqual(lines[0], 'id,issue_id,user__username,content,created_at')
+        self.assertEqual(len(lines), 10)
+
+    def test_ndjson_with_filters(self):
+        issue = self.issues[1]
+        AuditLog.objects.create(issue=issue, user=self.admin, action='Issue assigned')
+        AuditLog.objects.create(issue=self.issues[2], user=self.admin, action='Issue assigned')
+        response = self.client.get('/issues/api/audit-logs/export/', {
+            'output': 'ndjson', 'issue': issue.pk, 'created_after': (timezone.now() - timedelta(hours=1)).isoformat(),
+        })
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([(row['issue_id'], row['action']) for row in rows], [(issue.pk, 'Issue assigned')])
+
+        response = self.client.get('/issues/api/audit-logs/export/', {'created_before': '2000-01-01'})
+        self.assertEqual(self.read(response).splitlines(), ['id,issue_id,user__username,action,old_value,new_value,timestamp'])
+
+    def test_invalid_filters(self):
+        response = self.client.get('/issues/api/issues/export/', {'issue': 'x', 'created_after': 'soon', 'output': 'xml'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/issues/api/issues/export/', {'issue': 'x', 'created_after': 'soon'})
+        self.assertEqual(set(response.data), {'issue', 'created_after'})
+
+    def test_students_export_only_their_issues(self):
+        other = make_user('other', 'student')
+        self.client.force_authenticate(other)
+        lines = self.read(self.client.get('/issues/api/issues/export/')).splitlines()
+        self.assertEqual(len(lines), 1)
+
+
+class UploadTests(IssueFixtureMixin, TestCase):
+    content = bytes(range(256)) * 40
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = self.settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def start(self, **extra):
+        response = self.client.post('/issues/api/uploads/', {'filename': 'transcript.pdf', 'size': len(self.content), **extra})
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def put(self, upload_id, start, end):
+        return self.client.put(
+            f'/issues/api/uploads/{upload_id}/', self.content[start:end], content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end - 1}/{len(self.content)}',
+        )
+
+    def test_parse_content_range(self):
+        self.assertEqual(uploads.parse_content_range('bytes 0-9/100'), (0, 10, 100))
+        for header in (None, 'bytes 0-9', 'bytes 9-0/100', 'bytes 0-100/100'):
+            with self.assertRaises(uploads.UploadError):
+                uploads.parse_content_range(header)
+
+    def test_chunks_resume_from_the_stored_offset(self):
+        upload_id = self.start(sha256=hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.put(upload_id, 0, 4000).data['offset'], 4000)
+
+        # A retried or skipped chunk is refused with the offset to resume from
+        for start in (0, 6000):
+            response = self.put(upload_id, start, start + 1000)
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.data['offset'], 4000)
+
+        # Another worker (or a restart) has no running hash; it is rebuilt from disk
+        uploads._digests.clear()
+        self.assertEqual(self.put(upload_id, 4000, 8000).data['offset'], 8000)
+        response = self.put(upload_id, 8000, len(self.content))
+        self.assertEqual(response.data['status'], 'complete')
+        self.assertEqual(self.client.get(f'/issues/api/uploads/{upload_id}/').data['offset'], len(self.content))
+
+        blob = FileBlob.objects.get()
+        with blob.file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.content)
+        self.assertFalse(os.path.exists(uploads.partial_path(ChunkedUpload.objects.get(pk=upload_id))))
+
+    def test_short_chunk_leaves_the_offset_alone(self):
+        upload = uploads.start_upload(self.student.pk, 'transcript.pdf', len(self.content))
+        uploads.append_chunk(upload.pk, self.student.pk, BytesIO(self.content[:1000]), f'bytes 0-999/{len(self.content)}')
+        with self.assertRaises(uploads.UploadError):
+            # The connection drops 500 bytes into the chunk
+            uploads.append_chunk(
+                upload.pk, self.student.pk, BytesIO(self.content[1000:1500]), f'bytes 1000-2999/{len(self.content)}',
+            )
+        upload.refresh_from_db()
+        self.assertEqual(upload.offset, 1000)
+
+        # The bytes past the offset are overwritten and left out of the hash
+        upload, _ = uploads.append_chunk(
+            upload.pk, self.student.pk, BytesIO(self.content[1000:]), f'bytes 1000-{len(self.content) - 1}/{len(self.content)}',
+        )
+        self.assertEqual(upload.status, 'complete')
+        self.assertEqual(upload.blob.sha256, hashlib.sha256(self.content).hexdigest())
+
+    def test_checksum_mismatch_fails_the_upload(self):
+        upload_id = self.start(sha256='0' * 64)
+        response = self.put(upload_id, 0, len(self.content))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ChunkedUpload.objects.get(pk=upload_id).status, 'failed')
+        self.assertFalse(FileBlob.objects.exists())
+
+    def test_identical_files_share_one_blob(self):
+        for _ in range(2):
+            upload_id = self.start()
+            self.assertEqual(self.put(upload_id, 0, len(self.content)).data['status'], 'complete')
+        self.assertEqual(FileBlob.objects.count(), 1)
+        self.assertEqual(len(os.listdir(os.path.dirname(FileBlob.objects.get().file.path))), 1)
+
+        response = self.client.post(f'/issues/api/uploads/{upload_id}/attach/', {'issue': self.issues[0].pk})
+        self.assertEqual(response.status_code, 200)
+        self.issues[0].refresh_from_db()
+        self.assertEqual(self.issues[0].attachments.name, FileBlob.objects.get().file.name)
+        self.assertEqual(ChunkedUpload.objects.get(pk=upload_id).issue, self.issues[0])
+
+
+class SearchTests(IssueFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Issue.objects.filter(pk=cls.issues[1].pk).update(status='resolved')
+        Issue.objects.filter(pk=cls.issues[2].pk).update(status='in_progress', description='Resolved by phone')
+
+    def search(self, query):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get('/issues/api/issues/', {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['id'] for row in response.data['results'])
+
+    def test_text_and_comments(self):
+        self.assertEqual(self.search('missing mark'), [self.issues[0].pk, self.issues[1].pk])
+        self.assertEqual(self.search('following'), sorted(issue.pk for issue in self.issues))
+
+    def test_status_terms_match_the_status(self):
+        self.assertEqual(self.search('missing pending'), [self.issues[0].pk])
+        self.assertEqual(self.search('in_progress'), [self.issues[2].pk])
+        # Or the text, like any other term
+        self.assertEqual(self.search('Resolved'), [self.issues[1].pk, self.issues[2].pk])
@@ -0,0 +1,211 @@
+import datetime
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import ChunkedUpload, FileBlob
+
+PARTIAL_DIR = 'uploads/partial'
+BLOB_DIR = 'blobs'
+COPY_BUFFER = 64 * 1024
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+# upload id -> (offset, sha256 state). Losing an entry (another worker,
+# a restart) only costs re-hashing the partial file once.
+_digests = OrderedDict()
+_digests_lock = threading.Lock()
+MAX_DIGESTS = 256
+
+
+class UploadError(Exception):
+    """A chunk or upload the client has to correct; ``status`` is the HTTP status."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def parse_content_range(header):
+    """``bytes 0-1048575/5000000`` -> ``(start, length, total)``."""
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        raise UploadError("Content-Range must look like 'bytes start-end/total'")
+    start, end, total = (int(value) for value in match.groups())
+    if end < start or end >= total:
+        raise UploadError("Invalid Content-Range")
+    return start, end - start + 1, total
+
+
+def partial_path(upload):
+    return default_storage.path(f'{PARTIAL_DIR}/{upload.pk}.part')
+
+
+def blob_name(digest):
+    return f'{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}'
+
+
+def start_upload(user_id, filename, size, sha256='', content_type=''):
+    if size <= 0 or size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+        raise UploadError(f"Size must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes")
+    if sha256 and not re.fullmatch(r'[0-9a-f]{64}', sha256):
+        raise UploadError("sha256 must be 64 lowercase hex digits")
+    upload = ChunkedUpload.objects.create(
+        user_id=user_id,
+        filename=os.path.basename(filename)[:255],
+        content_type=content_type or mimetypes.guess_type(filename)[0] or '',
+        size=size,
+        expected_sha256=sha256,
+    )
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return upload
+
+
+def _digest_at(upload, path):
+    """The running hash of the first ``upload.offset`` bytes."""
+    with _digests_lock:
+        entry = _digests.pop(upload.pk, None)
+    if entry is not None and entry[0] == upload.offset:
+        return entry[1]
+    digest = hashlib.sha256()
+    remaining = upload.offset
+    with open(path, 'rb') as partial:
+        while remaining:
+            block = partial.read(min(COPY_BUFFER, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def _remember_digest(upload, digest):
+    with _digests_lock:
+        _digests[upload.pk] = (upload.offset, digest)
+        while len(_digests) > MAX_DIGESTS:
+            _digests.popitem(last=False)
+
+
+def append_chunk(upload_id, user_id, stream, content_range):
+    """
+    Write one chunk from ``stream`` straight into the partial file at its
+    final offset, hashing it on the way, and finish the upload when the
+    last byte arrives. The row lock serialises chunks of the same upload.
+    Returns the upload and the number of bytes written to disk.
+    """
+    start, length, total = parse_content_range(content_range)
+    if length > settings.CHUNKED_UPLOAD_MAX_CHUNK:
+        raise UploadError(f"Chunks may be at most {settings.CHUNKED_UPLOAD_MAX_CHUNK} bytes", status=413)
+
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().filter(pk=upload_id, user_id=user_id).first()
+        if upload is None:
+            raise UploadError("Upload not found", status=404)
+        if upload.status != 'pending':
+            raise UploadError(f"Upload is {upload.status}", status=409)
+        if total != upload.size:
+            raise UploadError("Content-Range total does not match the upload size")
+        if start != upload.offset:
+            # The client resumes from upload.offset
+            raise UploadError(f"Expected a chunk starting at byte {upload.offset}", status=409)
+
+        path = partial_path(upload)
+        digest = _digest_at(upload, path)
+        written = 0
+        with open(path, 'r+b') as partial:
+            partial.seek(start)
+            # Drop anything a failed earlier attempt left past the offset
+            partial.truncate()
+            while written < length:
+                block = stream.read(min(COPY_BUFFER, length - written))
+                if not block:
+                    break
+                partial.write(block)
+                digest.update(block)
+                written += len(block)
+        if written != length:
+            raise UploadError(f"Chunk ended after {written} of {length} bytes")
+
+        upload.offset += written
+        if upload.offset < upload.size:
+            upload.save(update_fields=['offset', 'updated_at'])
+            _remember_digest(upload, digest)
+            return upload, written
+        return complete_upload(upload, path, digest.hexdigest()), written
+
+
+def complete_upload(upload, path, digest):
+    """
+    Move the finished file into content-addressed storage with a rename (no
+    copy), or drop it if a blob with the same hash already exists. A file
+    that doesn't match the client's declared hash is discarded and the
+    upload marked failed.
+    """
+    if upload.expected_sha256 and upload.expected_sha256 != digest:
+        os.remove(path)
+        upload.status = 'failed'
+        upload.save(update_fields=['offset', 'status', 'updated_at'])
+        return upload
+
+    blob = FileBlob.objects.filter(sha256=digest).first()
+    if blob is None:
+        name = blob_name(digest)
+        final_path = default_storage.path(name)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(path, final_path)
+        try:
+            with transaction.atomic():
+                blob = FileBlob.objects.create(
+                    sha256=digest, size=upload.size, file=name, content_type=upload.content_type,
+                )
+        except IntegrityError:
+            # Same content finished concurrently; the rename wrote identical bytes
+            blob = FileBlob.objects.get(sha256=digest)
+    else:
+        os.remove(path)
+
+    upload.blob = blob
+    upload.status = 'complete'
+    upload.save(update_fields=['offset', 'blob', 'status', 'updated_at'])
+    return upload
+
+
+def attach_upload(upload, issue=None, comment=None):
+    """
+    Point an issue's or comment's file field at a completed upload's blob
+    and record where it went. Only the path is written; the file itself is
+    shared, not copied.
+    """
+    name = upload.blob.file.name
+    if issue is not None:
+        issue.attachments = name
+        issue.save(update_fields=['attachments', 'updated_at'])
+    if comment is not None:
+        comment.attachment = name
+        comment.save(update_fields=['attachment'])
+    upload.issue = issue
+    upload.comment = comment
+    upload.save(update_fields=['issue', 'comment', 'updated_at'])
+
+
+def purge_stale_uploads():
+    """Delete partial uploads idle for longer than CHUNKED_UPLOAD_EXPIRY."""
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.CHUNKED_UPLOAD_EXPIRY)
+    stale = list(ChunkedUpload.objects.filter(status='pending', updated_at__lt=cutoff))
+    for upload in stale:
+        try:
+            os.remove(partial_path(upload))
+        except FileNotFoundError:
+            pass
+    ChunkedUpload.objects.filter(pk__in=[upload.pk for upload in stale]).delete()
+    return len(stale)
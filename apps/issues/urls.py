@@ -15,8 +15,11 @@ router.register(r'issues', views.IssueViewSet)
 router.register(r'comments', views.CommentViewSet)
 router.register(r'audit-logs', views.AuditLogViewSet)
 router.register(r'notifications', views.NotificationViewSet)
+router.register(r'analytics', views.AnalyticsViewSet, basename='analytics')
+router.register(r'uploads', views.UploadViewSet, basename='upload')
 
 urlpatterns = [
+    path('api/stream/', views.notification_stream, name='notification-stream'),
     path('api/', include(router.urls)),
     path('api-auth/', include('rest_framework.urls')),
     path('api/token/', obtain_auth_token, name='api_token_auth'),
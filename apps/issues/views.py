@@ -1,20 +1,64 @@
-from rest_framework import viewsets, permissions, status, filters
+import asyncio
+import io
+import json
+from asgiref.sync import sync_to_async
+from rest_framework import viewsets, permissions, status, filters, exceptions
+from rest_framework.parsers import MultiPartParser
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Q
-from django.core.mail import send_mail
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
-from rest_framework.authentication import TokenAuthentication, SessionAuthentication
-from rest_framework.authentication import TokenAuthentication, SessionAuthentication
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.authentication import SessionAuthentication
+from apps.authentication.authentication import CachedTokenAuthentication
+from apps.authentication.bulk_import import FORMATS, guess_format, iter_rows
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import AllowAny
-from .models import User, Course, Enrollment, IssueCategory, Issue, Comment, AuditLog, Notification
+from .models import User, Course, Enrollment, IssueCategory, Issue, Comment, AuditLog, Notification, ChunkedUpload
+from .response_cache import CachedListMixin, metrics as response_cache_metrics
 from .serializers import (
     UserSerializer, CourseSerializer, EnrollmentSerializer, 
-    IssueCategorySerializer, IssueSerializer, CommentSerializer,
-    AuditLogSerializer, NotificationSerializer
+    IssueCategorySerializer, IssueSerializer, IssueListSerializer, IssueSearchResultSerializer,
+    CommentSerializer, AuditLogSerializer, NotificationSerializer, ChunkedUploadSerializer
 )
+from .query_planning import QueryPlanMixin, plan_queryset
+from .visibility import visible_issues, scope_to_visible_issues
+from .search import FullTextSearchFilter, rank_issues
+from .filtering import IssueFilter
+from .etags import issue_list_etag
+from .analytics import rollup_summary
+from .exports import StreamingExportMixin
+from .uploads import UploadError, start_upload, append_chunk, attach_upload
+from .downloads import serve_attachment
+from .artifacts import KINDS as ARTIFACT_KINDS, artifact_name
+from .directory import directory
+from .notifications import (
+    NotificationBatch, admin_ids, notify,
+    get_unread_count, adjust_unread_count, reset_unread_count, invalidate_unread_count
+)
+from .mail import queue_mail
+from .events import hub
+from .enrollment_import import EnrollmentLoader
+from .pagination import (
+    IssueCursorPagination, CommentCursorPagination,
+    AuditLogCursorPagination, NotificationCursorPagination
+)
+
+def serve_attachment_variant(request, name, uploads=None):
+    variant = request.query_params.get('variant')
+    if variant:
+        if variant not in ARTIFACT_KINDS:
+            return Response({"error": "Invalid variant"}, status=status.HTTP_400_BAD_REQUEST)
+        name = artifact_name(name, variant) if name else ''
+    return serve_attachment(request, name, uploads)
 
 class IsStudentPermission(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -33,7 +77,7 @@ class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['username', 'email', 'first_name', 'last_name']
-    authentication_classes = [TokenAuthentication, SessionAuthentication]
+    authentication_classes = [CachedTokenAuthentication, SessionAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     def get_permissions(self):
         if self.action in  ['create', 'update', 'partial_update', 'destroy']:
@@ -45,10 +89,27 @@ class UserViewSet(viewsets.ModelViewSet):
     def me(self, request):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def typeahead(self, request):
+        """
+        Prefix matches on username, email and names for ``?q=``, optionally
+        limited to one ``?user_type=``. Served from the in-memory directory.
+        """
+        user_type = request.query_params.get('user_type') or None
+        if user_type is not None and user_type not in dict(User.USER_TYPE_CHOICES):
+            return Response({"error": "Invalid user type"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response({"error": "Invalid limit"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(directory.search(request.query_params.get('q', ''), user_type, limit))
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(CachedListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
+    # lecturer_name comes from the user table
+    cache_dependencies = ('course', 'user')
     filter_backends = [filters.SearchFilter]
     search_fields = ['course_code', 'course_name']
     
@@ -59,78 +120,180 @@ class CourseViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated, IsLecturerPermission])
     def my_courses(self, request):
-        courses = Course.objects.filter(lecturer=request.user)
+        courses = plan_queryset(Course.objects.filter(lecturer=request.user), self.get_serializer_class())
         serializer = self.get_serializer(courses, many=True)
         return Response(serializer.data)
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+class EnrollmentViewSet(CachedListMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
+    cache_dependencies = ('enrollment', 'course', 'user')
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_load']:
             return [permissions.IsAuthenticated(), IsAdminPermission()]
         return [permissions.IsAuthenticated()]
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         user = self.request.user
         if user.user_type == 'student':
             return Enrollment.objects.filter(student=user)
         elif user.user_type == 'lecturer':
             return Enrollment.objects.filter(course__lecturer=user)
         return Enrollment.objects.all()
+    
+    def get_cache_scope(self):
+        # Matches get_base_queryset: students and lecturers see their own rows
+        user = self.request.user
+        if user.user_type in ('student', 'lecturer'):
+            return f'{user.user_type}:{user.pk}'
+        return 'all'
+    
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def bulk_load(self, request):
+        """
+        Upsert enrollments from an uploaded registrar export. Progress is
+        streamed back as one JSON line per chunk.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "A file is required"}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('format') or guess_format(upload.name)
+        if fmt not in FORMATS:
+            return Response({"error": "Unsupported file format"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        
+        def lines():
+            try:
+                for record in EnrollmentLoader().load(iter_rows(stream, fmt)):
+                    yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+            except ValueError as e:
+                yield json.dumps({"error": f"Could not parse file: {e}"}) + "\n"
+        
+        return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
 
-class IssueCategoryViewSet(viewsets.ModelViewSet):
+class IssueCategoryViewSet(CachedListMixin, viewsets.ModelViewSet):
     queryset = IssueCategory.objects.all()
     serializer_class = IssueCategorySerializer
+    cache_dependencies = ('issuecategory',)
     
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [permissions.IsAuthenticated(), IsAdminPermission()]
         return [permissions.IsAuthenticated()]
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(StreamingExportMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Issue.objects.all()
     serializer_class = IssueSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title', 'description', 'status']
+    export_name = 'issues'
+    export_columns = ('id', 'title', 'status', 'priority', 'course__course_code', 'category__name',
+                      'student__username', 'assigned_to__username', 'current_grade', 'expected_grade',
+                      'created_at', 'updated_at', 'resolved_at')
+    export_issue_field = 'pk'
+    filter_backends = [FullTextSearchFilter, IssueFilter]
     permission_classes = [IsAuthenticated]
+    pagination_class = IssueCursorPagination
+    planned_actions = ('list', 'retrieve', 'search')
+    max_search_results = 50
     def get_permissions(self):
         #if self.action == 'create':
             #return [permissions.IsAuthenticated(), IsStudentPermission()]
         return [permissions.IsAuthenticated()]
     
+    def get_base_queryset(self):
+        return visible_issues(self.request.user)
+    
+    def get_serializer_class(self):
+        # The full comment thread is only shipped on retrieve
+        if self.action == 'list':
+            return IssueListSerializer
+        if self.action == 'search':
+            return IssueSearchResultSerializer
+        return IssueSerializer
+    
     def get_queryset(self):
-        user = self.request.user
-        if user.user_type == 'student':
-            return Issue.objects.filter(student=user)
-        elif user.user_type == 'lecturer':
-            return Issue.objects.filter(
-                Q(course__lecturer=user) | Q(assigned_to=user)
-            ).distinct()
-        return Issue.objects.all()
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'search'):
+            return queryset
+        
+        requested = self.get_serializer_class().get_requested_fields(self.request)
+        comments = Comment.objects.filter(issue=OuterRef('pk')).order_by()
+        annotations = {
+            'comment_count': Coalesce(Subquery(
+                comments.values('issue').annotate(count=Count('pk')).values('count')
+            ), 0),
+            'last_comment_at': Subquery(
+                comments.order_by('-created_at').values('created_at')[:1]
+            ),
+            'has_unread': Exists(Notification.objects.filter(
+                issue=OuterRef('pk'), user=self.request.user, is_read=False
+            )),
+        }
+        if requested is not None:
+            annotations = {name: expr for name, expr in annotations.items() if name in requested}
+        return queryset.annotate(**annotations)
+    
+    def list(self, request, *args, **kwargs):
+        # Identical polls revalidate against cached versions instead of re-querying
+        etag = issue_list_etag(request)
+        if etag is None:
+            return super().list(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
     
     def perform_create(self, serializer):
         issue = serializer.save(student=self.request.user)
         
+        notifications = NotificationBatch(issue)
+        
         # Create notification for lecturer
-        if issue.course.lecturer:
-            Notification.objects.create(
-                user=issue.course.lecturer,
-                title="New Issue Reported",
-                message=f"A new issue '{issue.title}' has been reported for {issue.course.course_code}",
-                issue=issue
-            )
+        notifications.add(
+            issue.course.lecturer_id,
+            title="New Issue Reported",
+            message=f"A new issue '{issue.title}' has been reported for {issue.course.course_code}",
+        )
         
         # Create notification for admin
-        admin_users = User.objects.filter(user_type='admin')
-        for admin in admin_users:
-            Notification.objects.create(
-                user=admin,
-                title="New Issue Reported",
-                message=f"A new issue '{issue.title}' has been reported by {issue.student.get_full_name()}",
-                issue=issue
-            )
+        notifications.add_many(
+            admin_ids(),
+            title="New Issue Reported",
+            message=f"A new issue '{issue.title}' has been reported by {issue.student.get_full_name()}",
+        )
+        notifications.send()
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Best matches for ``?search=`` among the issues visible to the user,
+        ordered by relevance (prefix matching on every term).
+        """
+        query = request.query_params.get('search', '').strip()
+        if not query:
+            return Response({"error": "A search query is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_search_results)
+        except ValueError:
+            return Response({"error": "Invalid limit"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        issues = rank_issues(self.get_queryset(), query)[:max(limit, 1)]
+        serializer = self.get_serializer(issues, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def attachment(self, request, pk=None):
+        """
+        Download the issue's attachment (or with ``?variant=thumbnail|text``
+        a derived artefact); supports Range and conditional requests.
+        """
+        issue = self.get_object()
+        return serve_attachment_variant(request, issue.attachments.name, issue.attached_uploads.all())
     
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def assign(self, request, pk=None):
@@ -144,6 +307,8 @@ class IssueViewSet(viewsets.ModelViewSet):
             
             old_assigned = issue.assigned_to
             issue.assigned_to = assigned_to
+            # Logged below with the acting user; the change tracker skips it
+            issue._audited_fields = {'assigned_to_id'}
             issue.save()
             
             # Create audit log
@@ -156,8 +321,8 @@ class IssueViewSet(viewsets.ModelViewSet):
             )
             
             # Create notification
-            Notification.objects.create(
-                user=assigned_to,
+            notify(
+                assigned_to,
                 title="Issue Assigned",
                 message=f"You have been assigned to issue '{issue.title}'",
                 issue=issue
@@ -193,25 +358,20 @@ class IssueViewSet(viewsets.ModelViewSet):
         )
         
         # Create notification for student
-        Notification.objects.create(
-            user=issue.student,
+        notify(
+            issue.student_id,
             title="Issue Status Updated",
             message=f"Your issue '{issue.title}' status has been updated to {issue.get_status_display()}",
             issue=issue
         )
         
-        # Send email notification
+        # Queue email notification; the outbox worker delivers it
         if settings.EMAIL_HOST:
-            try:
-                send_mail(
-                    subject=f"Issue Status Update: {issue.title}",
-                    message=f"Your issue '{issue.title}' status has been updated to {issue.get_status_display()}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[issue.student.email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                print(f"Email sending failed: {e}")
+            queue_mail(
+                subject=f"Issue Status Update: {issue.title}",
+                message=f"Your issue '{issue.title}' status has been updated to {issue.get_status_display()}",
+                recipient_list=[issue.student.email],
+            )
         
         return Response({"success": "Status updated successfully"})
     
@@ -230,6 +390,8 @@ class IssueViewSet(viewsets.ModelViewSet):
         
         old_grade = issue.current_grade
         issue.current_grade = new_grade
+        # Logged below with the acting user; the change tracker skips it
+        issue._audited_fields = {'current_grade'}
         issue.save()
         
         # Update enrollment grade if it exists
@@ -247,8 +409,8 @@ class IssueViewSet(viewsets.ModelViewSet):
         )
         
         # Create notification for student
-        Notification.objects.create(
-            user=issue.student,
+        notify(
+            issue.student_id,
             title="Grade Updated",
             message=f"Your grade for {issue.course.course_code} has been updated to {new_grade}",
             issue=issue
@@ -256,97 +418,283 @@ class IssueViewSet(viewsets.ModelViewSet):
         
         return Response({"success": "Grade updated successfully"})
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(StreamingExportMixin, QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    pagination_class = CommentCursorPagination
+    export_name = 'comments'
+    export_columns = ('id', 'issue_id', 'user__username', 'content', 'created_at')
     
     def get_permissions(self):
         return [permissions.IsAuthenticated()]
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         issue_id = self.request.query_params.get('issue', None)
         if issue_id:
             return Comment.objects.filter(issue_id=issue_id)
         
-        user = self.request.user
-        if user.user_type == 'student':
-            return Comment.objects.filter(issue__student=user)
-        elif user.user_type == 'lecturer':
-            return Comment.objects.filter(
-                Q(issue__course__lecturer=user) | Q(issue__assigned_to=user)
-            ).distinct()
-        
-        return Comment.objects.all()
+        return scope_to_visible_issues(Comment.objects.all(), self.request.user)
+    
+    def get_export_queryset(self):
+        # ?issue= is applied on top of, not instead of, visibility
+        return scope_to_visible_issues(Comment.objects.all(), self.request.user)
+    
+    @action(detail=True, methods=['get'])
+    def attachment(self, request, pk=None):
+        """Download the comment's attachment if its issue is visible to the user."""
+        comment = scope_to_visible_issues(Comment.objects.all(), request.user).filter(pk=pk).first()
+        if comment is None:
+            return Response({"error": "Comment not found"}, status=status.HTTP_404_NOT_FOUND)
+        return serve_attachment_variant(request, comment.attachment.name, comment.attached_uploads.all())
     
     def perform_create(self, serializer):
         comment = serializer.save(user=self.request.user)
         issue = comment.issue
         
         # Create notifications
-        if self.request.user != issue.student:
-            Notification.objects.create(
-                user=issue.student,
+        author_id = self.request.user.pk
+        notifications = NotificationBatch(issue)
+        if author_id != issue.student_id:
+            notifications.add(
+                issue.student_id,
                 title="New Comment",
                 message=f"New comment on your issue '{issue.title}'",
-                issue=issue
             )
         
-        if issue.assigned_to and self.request.user != issue.assigned_to:
-            Notification.objects.create(
-                user=issue.assigned_to,
+        if issue.assigned_to_id and author_id != issue.assigned_to_id:
+            notifications.add(
+                issue.assigned_to_id,
                 title="New Comment",
                 message=f"New comment on issue '{issue.title}' that you're assigned to",
-                issue=issue
             )
             
-        if issue.course.lecturer and self.request.user != issue.course.lecturer:
-            Notification.objects.create(
-                user=issue.course.lecturer,
+        if issue.course.lecturer_id and author_id != issue.course.lecturer_id:
+            notifications.add(
+                issue.course.lecturer_id,
                 title="New Comment",
                 message=f"New comment on issue '{issue.title}' for your course {issue.course.course_code}",
-                issue=issue
             )
+        notifications.send()
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(StreamingExportMixin, QueryPlanMixin, viewsets.ReadOnlyModelViewSet):
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
+    pagination_class = AuditLogCursorPagination
+    export_name = 'audit-logs'
+    export_columns = ('id', 'issue_id', 'user__username', 'action', 'old_value', 'new_value', 'timestamp')
+    export_date_field = 'timestamp'
     
     def get_permissions(self):
         return [permissions.IsAuthenticated()]
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         issue_id = self.request.query_params.get('issue', None)
         if issue_id:
             return AuditLog.objects.filter(issue_id=issue_id)
         
-        user = self.request.user
-        if user.user_type == 'student':
-            return AuditLog.objects.filter(issue__student=user)
-        elif user.user_type == 'lecturer':
-            return AuditLog.objects.filter(
-                Q(issue__course__lecturer=user) | Q(issue__assigned_to=user)
-            ).distinct()
-        
-        return AuditLog.objects.all()
+        return scope_to_visible_issues(AuditLog.objects.all(), self.request.user)
+    
+    def get_export_queryset(self):
+        return scope_to_visible_issues(AuditLog.objects.all(), self.request.user)
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
+    pagination_class = NotificationCursorPagination
     
     def get_permissions(self):
         return [permissions.IsAuthenticated()]
     
-    def get_queryset(self):
+    def get_base_queryset(self):
         return Notification.objects.filter(user=self.request.user).order_by('-created_at')
     
+    def perform_create(self, serializer):
+        notification = serializer.save()
+        invalidate_unread_count(notification.user_id)
+    
+    def perform_update(self, serializer):
+        notification = serializer.save()
+        invalidate_unread_count(notification.user_id)
+    
+    def perform_destroy(self, instance):
+        user_id, was_unread = instance.user_id, not instance.is_read
+        instance.delete()
+        if was_unread:
+            adjust_unread_count(user_id, -1)
+    
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        if not notification.is_read:
+            notification.is_read = True
+            notification.save()
+            adjust_unread_count(notification.user_id, -1)
         return Response({"success": "Notification marked as read"})
     
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
-        return Response({"success": "All notifications marked as read"})
\ No newline at end of file
+        reset_unread_count(request.user.pk)
+        return Response({"success": "All notifications marked as read"})
+    
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """
+        Badge counter served from the cache. Clients should send
+        If-None-Match / If-Modified-Since so unchanged polls get a 304.
+        """
+        count, modified = get_unread_count(request.user.pk)
+        etag = f'"{count}-{modified}"'
+        response = get_conditional_response(request, etag=etag, last_modified=modified)
+        if response is None:
+            response = Response({"unread_count": count})
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """
+    Issue counts by status, priority and course, mean time to resolution
+    and open backlog per assignee, read from the stats rollup (refreshed by
+    the refresh_issue_stats command).
+    """
+    permission_classes = [permissions.IsAuthenticated, IsAdminPermission]
+    
+    def list(self, request):
+        return Response(rollup_summary())
+    
+    @action(detail=False, methods=['get'])
+    def response_cache(self, request):
+        """Hit rate and latency of cached list responses in this worker process."""
+        return Response(response_cache_metrics.snapshot())
+
+class UploadViewSet(viewsets.ViewSet):
+    """
+    Resumable chunked attachment uploads.
+    
+    POST /uploads/ with filename and size (and optionally sha256) opens an
+    upload. Each PUT /uploads/<id>/ sends raw bytes with a
+    ``Content-Range: bytes start-end/total`` header; a 409 carries the
+    offset to resume from. GET /uploads/<id>/ reports progress. Once
+    complete, POST /uploads/<id>/attach/ links the stored file to an issue
+    or comment.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get_upload(self, pk):
+        try:
+            return ChunkedUpload.objects.select_related('blob').get(pk=pk, user_id=self.request.user.pk)
+        except (ChunkedUpload.DoesNotExist, ValueError, DjangoValidationError):
+            raise exceptions.NotFound("Upload not found")
+    
+    def upload_error(self, error, upload_id=None):
+        payload = {"error": error.message}
+        if error.status == status.HTTP_409_CONFLICT and upload_id is not None:
+            payload["offset"] = ChunkedUpload.objects.filter(pk=upload_id).values_list('offset', flat=True).first()
+        return Response(payload, status=error.status)
+    
+    def create(self, request):
+        try:
+            size = int(request.data.get('size', 0))
+        except (TypeError, ValueError):
+            return Response({"error": "size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        filename = request.data.get('filename')
+        if not filename:
+            return Response({"error": "filename is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            upload = start_upload(
+                request.user.pk, filename, size,
+                sha256=(request.data.get('sha256') or '').lower(),
+                content_type=request.data.get('content_type') or '',
+            )
+        except UploadError as e:
+            return self.upload_error(e)
+        data = ChunkedUploadSerializer(upload).data
+        data['max_chunk_size'] = settings.CHUNKED_UPLOAD_MAX_CHUNK
+        return Response(data, status=status.HTTP_201_CREATED)
+    
+    def retrieve(self, request, pk=None):
+        return Response(ChunkedUploadSerializer(self.get_upload(pk)).data)
+    
+    def update(self, request, pk=None):
+        # The body is read straight from the request stream, never parsed
+        upload = self.get_upload(pk)
+        try:
+            upload, _ = append_chunk(upload.pk, request.user.pk, request.stream, request.META.get('HTTP_CONTENT_RANGE'))
+        except UploadError as e:
+            return self.upload_error(e, upload.pk)
+        if upload.status == 'failed':
+            return Response({"error": "Checksum mismatch; the upload was discarded"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(ChunkedUploadSerializer(upload).data)
+    
+    @action(detail=True, methods=['post'])
+    def attach(self, request, pk=None):
+        upload = self.get_upload(pk)
+        if upload.status != 'complete':
+            return Response({"error": "Upload is not complete"}, status=status.HTTP_409_CONFLICT)
+        
+        issue_id = request.data.get('issue')
+        comment_id = request.data.get('comment')
+        if bool(issue_id) == bool(comment_id):
+            return Response({"error": "Provide either issue or comment"}, status=status.HTTP_400_BAD_REQUEST)
+        if not str(issue_id or comment_id).isdecimal():
+            return Response({"error": "Expected an id"}, status=status.HTTP_400_BAD_REQUEST)
+        if issue_id:
+            issue = visible_issues(request.user).filter(pk=issue_id).first()
+            if issue is None:
+                return Response({"error": "Issue not found"}, status=status.HTTP_404_NOT_FOUND)
+            attach_upload(upload, issue=issue)
+        else:
+            comment = Comment.objects.filter(pk=comment_id, user_id=request.user.pk).first()
+            if comment is None:
+                return Response({"error": "Comment not found"}, status=status.HTTP_404_NOT_FOUND)
+            attach_upload(upload, comment=comment)
+        return Response({"success": "Attachment linked", "file": upload.blob.file.name})
+
+
+def _stream_user(request):
+    """Authenticate a plain Django request with the API's authenticators."""
+    drf_request = Request(request, authenticators=[
+        authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ])
+    try:
+        user = drf_request.user
+    except exceptions.APIException:
+        return None
+    return user if user.is_authenticated else None
+
+async def _event_stream(user_id):
+    heartbeat = settings.EVENT_STREAM_HEARTBEAT
+    # Subscribe once streaming starts so an aborted request leaves nothing behind
+    subscription = hub.subscribe(user_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing the idle connection
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(event['data'], cls=DjangoJSONEncoder)
+            yield f"event: {event['type']}\ndata: {data}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of the user's new notifications and status
+    changes on their issues. Serve under ASGI: an idle client is a pending
+    queue read, not a worker thread.
+    """
+    user = await sync_to_async(_stream_user)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."},
+                            status=status.HTTP_401_UNAUTHORIZED)
+    
+    response = StreamingHttpResponse(_event_stream(user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
\ No newline at end of file
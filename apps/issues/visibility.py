@@ -0,0 +1,61 @@
+from django.db.models import Q
+
+from .models import Course, Issue
+
+
+def lecturer_course_ids(user):
+    """
+    Ids of the courses taught by ``user``. A lecturer teaches a handful of
+    courses, so this is one cheap lookup on the ``course.lecturer`` index.
+    """
+    return list(Course.objects.filter(lecturer=user).values_list('pk', flat=True))
+
+
+def lecturer_issue_q(user):
+    """
+    Predicate for issues a lecturer can see: issues on their courses or
+    assigned to them.
+
+    The course ids are resolved up front so the predicate becomes
+    ``course_id IN (...) OR assigned_to_id = ...`` on the issue table alone.
+    It needs no join to ``course`` and no DISTINCT, and the database can
+    answer it by merging the (course, created_at) and
+    (assigned_to, created_at) indexes.
+    """
+    return Q(course_id__in=lecturer_course_ids(user)) | Q(assigned_to=user)
+
+
+def visible_issues(user, queryset=None):
+    """
+    Restrict ``queryset`` (all issues by default) to those ``user`` may see.
+    """
+    if queryset is None:
+        queryset = Issue.objects.all()
+    if user.user_type == 'student':
+        return queryset.filter(student=user)
+    if user.user_type == 'lecturer':
+        return queryset.filter(lecturer_issue_q(user))
+    return queryset
+
+
+def visible_issue_ids(user):
+    """
+    Subquery of the issue ids ``user`` may see, or ``None`` when the user is
+    not restricted.
+    """
+    if user.user_type not in ('student', 'lecturer'):
+        return None
+    return visible_issues(user).values('pk')
+
+
+def scope_to_visible_issues(queryset, user):
+    """
+    Restrict a queryset of rows hanging off an issue (comments, audit logs)
+    to the issues ``user`` may see. Lecturers get an ``issue_id IN
+    (SELECT ...)`` semi-join instead of an OR over two joins plus DISTINCT.
+    """
+    if user.user_type == 'student':
+        return queryset.filter(issue__student=user)
+    if user.user_type == 'lecturer':
+        return queryset.filter(issue__in=visible_issue_ids(user))
+    return queryset